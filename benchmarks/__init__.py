@@ -0,0 +1,5 @@
+"""Performance benchmarks for the GOV.UK widgets
+
+These are run by hand from the repository root, e.g.
+``python -m benchmarks.render_mode``, and are not collected by pytest.
+"""
@@ -0,0 +1,61 @@
+"""Compare import to first render time with and without a compiled template bundle
+
+Each run starts a fresh interpreter, imports the app and renders one of
+every widget, as the first request to a new worker or serverless
+instance would.
+"""
+
+import os
+import statistics
+import subprocess  # nosec
+import sys
+import tempfile
+
+from govuk_frontend_wtf.bundle import compile_bundle
+
+SCRIPT = """
+import sys
+import time
+
+start = time.perf_counter()
+
+from flask import render_template_string
+
+from tests.app import create_app
+from tests.fixtures.wtf_widgets_example_form import ExampleForm
+
+app = create_app(compiled_templates=sys.argv[1] or None)
+with app.test_request_context("/"):
+    render_template_string(
+        "{% for field in form %}{% if field.widget.template is defined %}{{ field }}{% endif %}{% endfor %}",
+        form=ExampleForm(),
+    )
+
+print(time.perf_counter() - start)
+"""
+
+
+def first_render(bundle):
+    output = subprocess.run([sys.executable, "-c", SCRIPT, bundle], capture_output=True, check=True, text=True)  # nosec
+    return float(output.stdout)
+
+
+def bench(bundle, repeat):
+    return statistics.median(first_render(bundle) for _ in range(repeat))
+
+
+def main(repeat=10):
+    with tempfile.TemporaryDirectory() as tempdir:
+        bundle = os.path.join(tempdir, "bundle")
+        compile_bundle(bundle)
+
+        source = bench("", repeat)
+        compiled = bench(bundle, repeat)
+
+    print(f"from source:     {source * 1000:.1f} ms to first render")
+    print(f"compiled bundle: {compiled * 1000:.1f} ms to first render")
+    print(f"saving:          {(1 - compiled / source) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
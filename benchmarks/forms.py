@@ -0,0 +1,102 @@
+"""Synthetic forms sized like the larger forms found in real services"""
+
+from flask_wtf import FlaskForm
+from wtforms import Form as NoCsrfForm
+from wtforms.fields import FieldList, FormField, SelectField, SelectMultipleField, StringField, SubmitField
+from wtforms.validators import InputRequired
+
+from govuk_frontend_wtf.render_plan import RenderPlanMixin
+from govuk_frontend_wtf.typeahead import PrefixIndex, TypeaheadField
+from govuk_frontend_wtf.wtforms_widgets import GovCheckboxesInput, GovSelect, GovSubmitInput, GovTextInput
+
+
+def make_text_form(count=50, planned=False):
+    """A form made up of `count` required text fields, optionally with a render plan"""
+    attrs = {
+        f"text_field_{index}": StringField(
+            f"Text field {index}",
+            widget=GovTextInput(),
+            validators=[InputRequired(message=f"Enter text field {index}")],
+            description=f"Hint for text field {index}",
+        )
+        for index in range(count)
+    }
+    attrs["submit"] = SubmitField("Continue", widget=GovSubmitInput())
+
+    bases = (RenderPlanMixin, FlaskForm) if planned else (FlaskForm,)
+
+    return type("TextForm", bases, attrs)
+
+
+def make_select_form(count=5000):
+    """A form with one select field of `count` options"""
+    choices = [("", "Select an option")] + [(f"option-{index}", f"Option {index}") for index in range(count)]
+
+    class SelectForm(FlaskForm):
+        select_field = SelectField(
+            "Select field",
+            widget=GovSelect(),
+            validators=[InputRequired(message="Select an option")],
+            choices=choices,
+            default="",
+            description="Select field hint",
+        )
+
+    return SelectForm
+
+
+def make_checkboxes_form(count=200):
+    """A form with one multiple select field rendered as `count` checkboxes"""
+    choices = [(f"option-{index}", f"Option {index}") for index in range(count)]
+
+    class CheckboxesForm(FlaskForm):
+        checkboxes_field = SelectMultipleField(
+            "Checkboxes field",
+            widget=GovCheckboxesInput(),
+            validators=[InputRequired(message="Select at least one option")],
+            choices=choices,
+            description="Checkboxes field hint",
+        )
+
+    return CheckboxesForm
+
+
+def make_typeahead_form(count=50000):
+    """A form with one typeahead field searching `count` choices, whose index is the form's `index` attribute"""
+    index = PrefixIndex("options", [(f"option-{index}", f"Option {index}") for index in range(count)])
+
+    class TypeaheadForm(FlaskForm):
+        typeahead_field = TypeaheadField(
+            "Typeahead field",
+            validators=[InputRequired(message="Select an option")],
+            index=index,
+            default="option-1",
+            description="Typeahead field hint",
+        )
+
+    TypeaheadForm.index = index
+
+    return TypeaheadForm
+
+
+class RowForm(NoCsrfForm):
+    title_number = StringField(
+        "Title number",
+        widget=GovTextInput(),
+        validators=[InputRequired(message="Enter a title number")],
+        description="For example, AB123456",
+    )
+    postcode = StringField(
+        "Postcode",
+        widget=GovTextInput(),
+        validators=[InputRequired(message="Enter a postcode")],
+    )
+
+
+def make_field_list_form(count=500, widget=None):
+    """A form with a FieldList of `count` FormField rows, optionally rendered by `widget`"""
+
+    class FieldListForm(FlaskForm):
+        rows = FieldList(FormField(RowForm), min_entries=count, widget=widget)
+
+    return FieldListForm
@@ -0,0 +1,59 @@
+"""Time merge_params against the deepmerge Merger it replaced
+
+deepmerge is no longer a dependency, so it is only compared against
+when it happens to be installed.
+"""
+
+import timeit
+
+from govuk_frontend_wtf.main import merge_params
+
+
+def make_params():
+    return {
+        "id": "email",
+        "name": "email",
+        "label": {"text": "Email address"},
+        "attributes": {},
+        "hint": {"text": "We'll only use this to send you a receipt"},
+        "value": "",
+        "type": "text",
+    }
+
+
+TEMPLATE_PARAMS = {
+    "type": "email",
+    "spellcheck": False,
+    "autocomplete": "email",
+    "label": {"classes": "govuk-label--m"},
+}
+ATTRIBUTES = {"required": True, "data-module": "example"}
+
+
+def bench(merge, number):
+    def map_params():
+        params = merge(make_params(), TEMPLATE_PARAMS)
+        params["attributes"] = merge(params["attributes"], ATTRIBUTES)
+
+    return min(timeit.repeat(map_params, number=number, repeat=5)) / number
+
+
+def main(number=100000):
+    baseline = bench(lambda a, b: a, number)
+    fast = bench(merge_params, number) - baseline
+    print(f"merge_params: {fast * 1e6:.3f} us/field")
+
+    try:
+        from deepmerge import Merger
+    except ImportError:
+        print("deepmerge not installed, skipping comparison")
+        return
+
+    merger = Merger([(list, ["append"]), (dict, ["merge"])], ["override"], ["override"])
+    slow = bench(merger.merge, number) - baseline
+    print(f"deepmerge:    {slow * 1e6:.3f} us/field")
+    print(f"speed up:     {slow / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Measure how bulk pre-rendering scales with the number of processes
+
+Renders the example form for the same set of records with 1, 2, 4 and 8
+worker processes, up to the number of CPUs, writing the pages to a
+temporary directory, and reports the throughput of each relative to a
+single process.
+"""
+
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+from govuk_frontend_wtf.prerender import prerender
+
+FORM = "tests.fixtures.wtf_widgets_example_form:ExampleForm"
+
+
+def make_records(count):
+    return [
+        {"id": f"case-{number}", "data": {"string_field": f"Case {number}", "date_field": ["1", "2", "2020"]}}
+        for number in range(count)
+    ]
+
+
+def main(count=2000):
+    records = make_records(count)
+    process_counts = [processes for processes in (1, 2, 4, 8) if processes <= (os.cpu_count() or 1)]
+
+    print(f"{count} records, {os.cpu_count()} CPUs")
+    print(f"{'processes':>9} {'pages/s':>10} {'scaling':>8}")
+
+    baseline = None
+    for processes in process_counts:
+        with tempfile.TemporaryDirectory() as output:
+            start = perf_counter()
+            prerender(FORM, records, output, processes=processes)
+            throughput = count / (perf_counter() - start)
+
+        baseline = baseline or throughput
+        print(f"{processes:>9} {throughput:>10.1f} {throughput / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
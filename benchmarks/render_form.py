@@ -0,0 +1,46 @@
+"""Compare rendering a form field by field with render_form
+
+Both pages render the same 50 text fields and submit button, first with
+a template call per field and then with a single render_form call, in
+each of the render modes.
+"""
+
+import timeit
+
+from flask import render_template_string
+
+from benchmarks.forms import make_text_form
+from tests.app import create_app
+
+PER_FIELD = "{% for field in form %}{{ field() }}{% endfor %}"
+BATCH = "{{ render_form(form) }}"
+
+
+def bench(template, fast_render, number):
+    app = create_app(fast_render=fast_render)
+    app.config["WTF_CSRF_ENABLED"] = False
+    form_class = make_text_form(50)
+
+    with app.test_request_context("/"):
+        form = form_class()
+
+        def render_page():
+            render_template_string(template, form=form)
+
+        render_page()
+        return min(timeit.repeat(render_page, number=number, repeat=7)) / number
+
+
+def main(number=20):
+    for fast_render in (False, True):
+        per_field = bench(PER_FIELD, fast_render, number)
+        batch = bench(BATCH, fast_render, number)
+
+        print(f"fast_render={fast_render}")
+        print(f"  per field:   {per_field * 1000:.3f} ms/page")
+        print(f"  render_form: {batch * 1000:.3f} ms/page")
+        print(f"  saving:      {(1 - batch / per_field) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Compare widget render time with and without fast_render
+
+The app registers a context processor that does a small amount of
+work, standing in for the session and feature flag lookups a real
+service would make, so the cost of running it once per field shows.
+"""
+
+import time
+import timeit
+
+from flask import render_template_string
+
+from tests.app import create_app
+from tests.fixtures.wtf_widgets_example_form import ExampleForm
+
+TEMPLATE = """
+{% for field in form %}{% if field.widget.template is defined %}{{ field }}{% endif %}{% endfor %}
+"""
+
+
+def make_app(fast_render):
+    app = create_app(fast_render=fast_render)
+    app.config["WTF_CSRF_ENABLED"] = False
+
+    @app.context_processor
+    def feature_flags():
+        # Simulate a per-call lookup against a local store
+        time.sleep(0.0001)
+        return {"feature_flags": {}}
+
+    return app
+
+
+def bench(fast_render, number):
+    app = make_app(fast_render)
+
+    def render_page():
+        with app.test_request_context("/"):
+            render_template_string(TEMPLATE, form=ExampleForm())
+
+    render_page()
+    return min(timeit.repeat(render_page, number=number, repeat=5)) / number
+
+
+def main(number=50):
+    standard = bench(False, number)
+    fast = bench(True, number)
+
+    print(f"render_template: {standard * 1000:.3f} ms/page")
+    print(f"fast_render:     {fast * 1000:.3f} ms/page")
+    print(f"saving:          {(1 - fast / standard) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""Benchmark suite for the widget render hot path
+
+Times every widget in ``wtforms_widgets``, the error summary helpers and
+full page renders of large synthetic forms. Runs entirely offline.
+
+Usage::
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --output results.json --compare baseline.json
+
+With ``--compare``, each case is checked against the saved baseline and the
+process exits non-zero if any case is slower by more than ``--tolerance``.
+"""
+
+import argparse
+import inspect
+import json
+import platform
+import statistics
+import sys
+import time
+import timeit
+from contextlib import contextmanager
+from importlib.metadata import version
+
+from flask import render_template_string
+
+from benchmarks.forms import (
+    make_checkboxes_form,
+    make_field_list_form,
+    make_select_form,
+    make_text_form,
+    make_typeahead_form,
+)
+from govuk_frontend_wtf import wtforms_widgets
+from govuk_frontend_wtf.gov_form_base import GovFormBase
+from govuk_frontend_wtf.main import flatten_errors, get_id_map, wtforms_errors
+from govuk_frontend_wtf.wtforms_widgets import GovFieldList
+from tests.app import create_app
+from tests.fixtures.wtf_widgets_example_form import ExampleForm
+
+PAGE_TEMPLATE = """
+{%- from 'govuk_frontend_jinja/components/error-summary/macro.html' import govukErrorSummary -%}
+{% if form.errors %}{{ govukErrorSummary(wtforms_errors(form)) }}{% endif %}
+<form method="post" novalidate>
+{% for field in form %}
+  {% if field.type == 'FieldList' and field.widget.template is not defined %}
+    {% for row in field %}{% for subfield in row %}{{ subfield }}{% endfor %}{% endfor %}
+  {% elif field.widget.template is defined %}
+    {{ field }}
+  {% endif %}
+{% endfor %}
+</form>
+"""
+
+# Widgets which are only used as a base for the others
+BASE_WIDGETS = {"GovInput"}
+
+# Widgets with no field on the example form, which are timed by a page case instead
+PAGE_WIDGETS = {"GovFieldList", "GovTypeahead"}
+
+
+def widget_classes():
+    """Return the name of every concrete widget in wtforms_widgets"""
+    return sorted(
+        name
+        for name, cls in inspect.getmembers(wtforms_widgets, inspect.isclass)
+        if issubclass(cls, GovFormBase)
+        and cls.__module__ == wtforms_widgets.__name__
+        and name not in BASE_WIDGETS | PAGE_WIDGETS
+    )
+
+
+@contextmanager
+def bound_form(app, form_class, **request):
+    """Bind and validate a form inside a request context"""
+    with app.test_request_context("/", **request):
+        form = form_class()
+        if request.get("method") == "post":
+            form.validate()
+        yield form
+
+
+def field_list_post_data(count):
+    data = {}
+    for index in range(count):
+        data[f"rows-{index}-title_number"] = ""
+        data[f"rows-{index}-postcode"] = "SW1A 1AA"
+    return data
+
+
+def unmemoized_wtforms_errors(form):
+    """Build the error summary params as on the first call for a form, without its memoized error list"""
+    form.__dict__.pop("_gov_errors_memo", None)
+    return wtforms_errors(form)
+
+
+def flatten_errors_with_id_map(form):
+    return flatten_errors(form.errors, id_map=get_id_map(form))
+
+
+def cases(app, typeahead_form):
+    """Yield (name, request kwargs, form class, function of form) tuples
+
+    ``typeahead_form`` is a form from ``make_typeahead_form`` whose index is
+    registered with the app.
+    """
+    example_fields = {}
+    with bound_form(app, ExampleForm) as form:
+        for field in form:
+            example_fields.setdefault(type(field.widget).__name__, field.name)
+
+    for widget_name in widget_classes():
+        field_name = example_fields[widget_name]
+        yield f"widget.{widget_name}", {}, ExampleForm, lambda form, name=field_name: form[name]()
+
+    post = {"method": "post", "data": {}}
+    yield "errors.wtforms_errors", post, ExampleForm, unmemoized_wtforms_errors
+    yield "errors.wtforms_errors.memoized", post, ExampleForm, wtforms_errors
+    yield "errors.flatten_errors", post, ExampleForm, lambda form: flatten_errors(form.errors)
+
+    field_list_post = {"method": "post", "data": field_list_post_data(500)}
+    field_list_form = make_field_list_form(500)
+    yield "errors.wtforms_errors.field_list_500", field_list_post, field_list_form, unmemoized_wtforms_errors
+    yield "errors.flatten_errors.field_list_500", field_list_post, field_list_form, flatten_errors_with_id_map
+
+    def render_page(form):
+        return render_template_string(PAGE_TEMPLATE, form=form)
+
+    yield "page.text_fields_50", {}, make_text_form(50), render_page
+    yield "page.text_fields_50.errors", post, make_text_form(50), render_page
+    yield "page.text_fields_50.render_plan", {}, make_text_form(50, planned=True), render_page
+    yield "page.select_5000", {}, make_select_form(5000), render_page
+    yield "page.checkboxes_200", {}, make_checkboxes_form(200), render_page
+    yield "page.typeahead_50000", {}, typeahead_form, render_page
+    yield "page.field_list_500", {}, field_list_form, render_page
+    yield "page.field_list_500.errors", field_list_post, field_list_form, render_page
+    yield "page.field_list_500.gov_field_list", {}, make_field_list_form(500, widget=GovFieldList()), render_page
+
+
+def measure(func, repeat, min_time):
+    """Time func, calibrating the number of calls per sample to min_time"""
+    func()
+    number = 1
+    while True:
+        elapsed = timeit.timeit(func, number=number)
+        if elapsed >= min_time:
+            break
+        number *= 2
+
+    samples = [timeit.timeit(func, number=number) / number for _ in range(repeat)]
+
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "calls": number,
+        "repeat": repeat,
+    }
+
+
+def run(repeat=5, min_time=0.1, only=None):
+    typeahead_form = make_typeahead_form(50000)
+    app = create_app(typeahead=[typeahead_form.index])
+    app.config["WTF_CSRF_ENABLED"] = False
+
+    results = {}
+    for name, request, form_class, func in cases(app, typeahead_form):
+        if only and only not in name:
+            continue
+        with bound_form(app, form_class, **request) as form:
+            results[name] = measure(lambda: func(form), repeat, min_time)
+        print(f"{name:<45} {results[name]['min'] * 1000:>10.3f} ms", file=sys.stderr)
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "versions": {
+                package: version(package) for package in ("flask", "jinja2", "wtforms", "govuk-frontend-jinja")
+            },
+        },
+        "results": results,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Print a comparison against baseline and return the regressed case names"""
+    regressions = []
+    print(f"\n{'case':<45} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, result in results["results"].items():
+        if name not in baseline["results"]:
+            print(f"{name:<45} {'-':>12} {result['min'] * 1000:>9.3f} ms {'new':>8}")
+            continue
+        before = baseline["results"][name]["min"]
+        change = result["min"] / before - 1
+        flag = ""
+        if change > tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<45} {before * 1000:>9.3f} ms {result['min'] * 1000:>9.3f} ms {change:>+8.1%}{flag}")
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare against a saved results file")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed slowdown before failing (default 0.1)")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per case (default 5)")
+    parser.add_argument("--min-time", type=float, default=0.1, help="minimum seconds per sample (default 0.1)")
+    parser.add_argument("--filter", help="only run cases whose name contains this string")
+    args = parser.parse_args(argv)
+
+    results = run(repeat=args.repeat, min_time=args.min_time, only=args.filter)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed by more than {args.tolerance:.0%}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Render the example form from many threads at once
+
+Each thread renders the example form page, both empty and with submitted
+data failing validation, in its own request context. Every page is
+checked against one rendered up front on the main thread, and the
+throughput for each thread count is reported relative to the first.
+
+On a free-threaded build of Python (3.13t or later, with the GIL disabled)
+throughput should scale with the number of cores; with the GIL it stays
+roughly flat, but the output must still match.
+
+Usage::
+
+    python -m benchmarks.threads
+    python -m benchmarks.threads --threads 1 2 4 8 16 --renders 200 --fast-render
+"""
+
+import argparse
+import sys
+import threading
+from time import perf_counter
+
+from flask import render_template_string
+
+from benchmarks.suite import PAGE_TEMPLATE
+from tests.app import create_app
+from tests.fixtures.wtf_widgets_example_form import ExampleForm
+
+POST_DATA = {
+    "string_field": "foo",
+    "date_field": ["1", "2", "2020"],
+    "date_field_default": ["", "", ""],
+    "select_field": "one",
+    "checkboxes_field": ["one", "two"],
+}
+
+
+def render_page(app, data):
+    """Render the example form page, validating the submitted data if there is any"""
+    if data is None:
+        context = app.test_request_context("/")
+    else:
+        context = app.test_request_context("/", method="post", data=data)
+
+    with context:
+        form = ExampleForm()
+        if data is not None:
+            form.validate_on_submit()
+        return render_template_string(PAGE_TEMPLATE, form=form)
+
+
+def run(app, expected, thread_count, renders):
+    """Render ``renders`` pages on each of ``thread_count`` threads, returning the elapsed time and mismatches"""
+    barrier = threading.Barrier(thread_count + 1)
+    mismatches = []
+
+    def worker():
+        barrier.wait()
+        for index in range(renders):
+            data = POST_DATA if index % 2 else None
+            if render_page(app, data) != expected[data is not None]:
+                mismatches.append(index)
+
+    threads = [threading.Thread(target=worker) for _ in range(thread_count)]
+    for thread in threads:
+        thread.start()
+
+    barrier.wait()
+    start = perf_counter()
+    for thread in threads:
+        thread.join()
+
+    return perf_counter() - start, len(mismatches)
+
+
+def gil_enabled():
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--renders", type=int, default=100, help="pages rendered by each thread")
+    parser.add_argument("--fast-render", action="store_true")
+    args = parser.parse_args(argv)
+
+    app = create_app(fast_render=args.fast_render)
+    app.config["WTF_CSRF_ENABLED"] = False
+    expected = (render_page(app, None), render_page(app, POST_DATA))
+
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil_enabled() else 'disabled'}")
+    print(f"{'threads':>7} {'pages/s':>10} {'scaling':>8} {'mismatches':>10}")
+
+    baseline = None
+    failed = False
+    for thread_count in args.threads:
+        elapsed, mismatches = run(app, expected, thread_count, args.renders)
+        throughput = thread_count * args.renders / elapsed
+        baseline = baseline or throughput
+        failed = failed or bool(mismatches)
+        print(f"{thread_count:>7} {throughput:>10.1f} {throughput / baseline:>7.2f}x {mismatches:>10}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
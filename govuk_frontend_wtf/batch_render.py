@@ -0,0 +1,110 @@
+import os
+from inspect import isawaitable
+from weakref import WeakKeyDictionary
+
+from jinja2 import TemplateNotFound
+from markupsafe import Markup
+
+from govuk_frontend_wtf.globals import get_app
+from govuk_frontend_wtf.gov_form_base import GovFormBase
+from govuk_frontend_wtf.main import find_field, iter_fields
+
+
+class GovForm(GovFormBase):
+    """Renders the mapped params of many fields in a single template pass
+
+    The govuk macros for the built in widgets are imported once, and each
+    field is rendered by calling its macro. Fields with any other template,
+    including a built in widget's template which the app overrides, are
+    rendered by including it.
+    """
+
+    template = "govuk_frontend_wtf/form.html"
+
+
+_form_widget = GovForm()
+
+PACKAGE_TEMPLATES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+# Whether each widget template resolves to the package's own, by environment
+_package_templates = WeakKeyDictionary()
+
+
+def is_package_template(env, name):
+    """Return whether the app's loader resolves a template name to the one shipped in this package"""
+    resolved = _package_templates.get(env)
+    if resolved is None:
+        resolved = _package_templates.setdefault(env, {})
+
+    result = resolved.get(name)
+    if result is None:
+        prefix, _, path = name.partition("/")
+        try:
+            filename = env.loader.get_source(env, name)[1]
+        except TemplateNotFound:
+            filename = None
+
+        result = resolved[name] = (
+            prefix == "govuk_frontend_wtf"
+            and filename is not None
+            and os.path.normcase(os.path.abspath(filename)) == os.path.normcase(os.path.join(PACKAGE_TEMPLATES, path))
+        )
+
+    return result
+
+
+def render_form(form, layout=None):
+    """Render the fields of a form in a single template pass
+
+    The params of every field are mapped first, then all the fields are
+    rendered by one template, rather than rendering a template per field.
+    The fragment cache and instrumentation aren't used.
+
+    :param form: the form to render.
+    :param layout: optionally, the names of the fields to render, in
+        order, e.g. ``["name", "rows-0-postcode"]``. Markup in the layout is
+        output as is, e.g. for headings between fields. Defaults to every
+        field in the form.
+    """
+    env = get_app().jinja_env
+    items = [map_item(env, entry) for entry in iter_layout(form, layout)]
+
+    if env.is_async:
+        return render_form_async(items)
+
+    return _form_widget.render({"items": items})
+
+
+async def render_form_async(items):
+    for item in items:
+        if isawaitable(item.get("params")):
+            item["params"] = await item["params"]
+
+    return await _form_widget.render_async({"items": items})
+
+
+def map_item(env, entry):
+    if isinstance(entry, Markup):
+        return {"html": entry}
+
+    if isinstance(entry.widget, GovFormBase):
+        template = entry.widget.template
+        return {
+            "template": template,
+            "params": entry(_gov_map_only=True),
+            "macro": is_package_template(env, template),
+        }
+
+    return {"html": entry()}
+
+
+def iter_layout(form, layout=None):
+    """Yield the fields, and any markup, to render
+
+    FormFields and FieldLists are expanded into their subfields unless
+    they have a GOV.UK widget of their own, as for ``wtforms_stream``.
+    """
+    if layout is None:
+        return iter_fields(form)
+
+    return iter_fields([entry if isinstance(entry, Markup) else find_field(form, entry)[1] for entry in layout])
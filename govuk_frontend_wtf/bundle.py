@@ -0,0 +1,191 @@
+"""Ahead of time compiled template bundles
+
+Compiles the widget templates and the govuk macro templates they import
+into Python modules, so that apps started from a cold cache import
+them rather than parsing and compiling Jinja source. Build a bundle
+with::
+
+    govuk-frontend-wtf-compile path/to/bundle
+
+and load it with ``WTFormsHelpers(app, compiled_templates="path/to/bundle")``.
+
+Each bundle has a manifest recording what it was built with, and a
+checksum of the source of each template in it. Templates are compiled
+from source instead when the bundle doesn't match the app, or when the
+app overrides them.
+"""
+
+import argparse
+import compileall
+import hashlib
+import importlib
+import json
+import os
+import zipfile
+from importlib.metadata import version
+
+from jinja2 import ChoiceLoader, Environment, ModuleLoader, PackageLoader, PrefixLoader, TemplateNotFound
+
+from govuk_frontend_wtf.minify import MinifyExtension
+from govuk_frontend_wtf.warm_up import find_templates, iter_widget_templates
+
+MANIFEST = "govuk-frontend-wtf.json"
+
+
+class BundleLoader(ChoiceLoader):
+    """Load templates from a compiled bundle, falling back to another loader
+
+    A template is only imported from the bundle if the source the fallback
+    loader finds for it is the source it was compiled from, so templates
+    the app overrides, or which have changed since the bundle was built,
+    are compiled from source. Template source, used for tracebacks and by
+    the template warm-up, is always read through the fallback loader.
+
+    :param path: the bundle directory or zip file.
+    :param loader: the loader to use for templates not in the bundle.
+    :param checksums: the checksum of the source of each template in the
+        bundle, by name, from its manifest.
+    """
+
+    def __init__(self, path, loader, checksums):
+        super().__init__([ModuleLoader(path), loader])
+        self.checksums = checksums
+
+    def load(self, environment, name, globals=None):
+        checksum = self.checksums.get(name)
+        if checksum is not None and checksum == get_checksum(self.get_source(environment, name)[0]):
+            try:
+                return self.loaders[0].load(environment, name, globals)
+            except TemplateNotFound:
+                pass
+
+        return self.loaders[1].load(environment, name, globals)
+
+    def get_source(self, environment, template):
+        return self.loaders[1].get_source(environment, template)
+
+    def list_templates(self):
+        return self.loaders[1].list_templates()
+
+
+def create_environment(enable_async=False, minify=False):
+    """Return an environment which loads templates the way the README configures Flask to
+
+    Compiled templates depend on the environment's autoescaping and async
+    options, which here match Flask's for ``.html`` templates, and on
+    whether they are minified.
+    """
+    return Environment(
+        loader=PrefixLoader(
+            {
+                "govuk_frontend_jinja": PackageLoader("govuk_frontend_jinja"),
+                "govuk_frontend_wtf": PackageLoader("govuk_frontend_wtf"),
+            }
+        ),
+        autoescape=True,
+        enable_async=enable_async,
+        extensions=[MinifyExtension] if minify else [],
+    )
+
+
+def get_checksum(source):
+    """Return the checksum of a template's source, as recorded in a manifest"""
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def get_build_options(env):
+    """Return the options which templates compiled in an environment depend on, as recorded in a manifest"""
+    return {
+        "jinja2": version("jinja2"),
+        "govuk-frontend-jinja": version("govuk-frontend-jinja"),
+        "enable_async": env.is_async,
+        "minify": any(isinstance(extension, MinifyExtension) for extension in env.extensions.values()),
+    }
+
+
+def read_manifest(path):
+    """Return the manifest of the bundle at ``path``, or None if it has none"""
+    try:
+        if zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as bundle:
+                return json.loads(bundle.read(MANIFEST))
+
+        with open(os.path.join(path, MANIFEST), encoding="utf-8") as stream:
+            return json.load(stream)
+    except (KeyError, OSError, ValueError):
+        return None
+
+
+def check_manifest(manifest, env):
+    """Return why a bundle with ``manifest`` can't be used in ``env``, or None if it can"""
+    if manifest is None:
+        return "it has no manifest, so it was built by an older version"
+
+    for option, value in get_build_options(env).items():
+        if manifest.get(option) != value:
+            return f"it was built with {option} {manifest.get(option)!r} but the app has {value!r}"
+
+    return None
+
+
+def compile_bundle(target, zip=None, enable_async=False, minify=False):
+    """Compile the widget templates and the templates they import into ``target``
+
+    A directory bundle is also byte compiled, so it can be shipped with
+    its ``__pycache__`` to read only file systems. The bundle's manifest
+    records the options and package versions it was built with, and the
+    checksum of each template's source.
+
+    :param target: the directory, or zip file if ``zip`` is given, to write.
+    :param zip: ``"deflated"`` or ``"stored"`` to write a zip file.
+    :param enable_async: compile for apps with an async Jinja environment.
+    :param minify: compile for apps using the ``minify`` option.
+    :returns: the names of the templates compiled.
+    """
+    env = create_environment(enable_async=enable_async, minify=minify)
+    names = find_templates(env, iter_widget_templates())
+
+    env.compile_templates(target, filter_func=names.__contains__, zip=zip, ignore_errors=False)
+
+    manifest = get_build_options(env)
+    manifest["templates"] = {name: get_checksum(env.loader.get_source(env, name)[0]) for name in sorted(names)}
+    manifest = json.dumps(manifest, indent=2, sort_keys=True)
+
+    if zip is None:
+        compileall.compile_dir(target, quiet=1)
+        with open(os.path.join(target, MANIFEST), "w", encoding="utf-8") as stream:
+            stream.write(manifest)
+    else:
+        with zipfile.ZipFile(target, "a") as bundle:
+            bundle.writestr(MANIFEST, manifest)
+
+    return sorted(names)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile govuk-frontend-wtf templates into a bundle")
+    parser.add_argument("target", help="directory, or zip file with --zip, to write the bundle to")
+    parser.add_argument("--zip", action="store_true", help="write a zip file rather than a directory")
+    parser.add_argument("--async", dest="enable_async", action="store_true", help="compile for async environments")
+    parser.add_argument("--minify", action="store_true", help="compile for apps using the minify option")
+    parser.add_argument(
+        "--import",
+        dest="modules",
+        action="append",
+        default=[],
+        metavar="MODULE",
+        help="import a module defining custom widgets, so their templates are included",
+    )
+    args = parser.parse_args(argv)
+
+    for module in args.modules:
+        importlib.import_module(module)
+
+    names = compile_bundle(
+        args.target, zip="deflated" if args.zip else None, enable_async=args.enable_async, minify=args.minify
+    )
+    print(f"Compiled {len(names)} templates to {args.target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from weakref import WeakKeyDictionary
+
+from jinja2 import TemplateNotFound
+from markupsafe import Markup
+
+# The fingerprint of each compiled widget template, see get_fingerprint
+_fingerprints = WeakKeyDictionary()
+
+
+class LRUCache(object):
+    """A small thread safe, size bounded, least recently used cache
+
+    :param maxsize: the number of entries to hold before the least
+        recently used entry is evicted.
+    :param ttl: optional number of seconds after which an entry expires.
+    """
+
+    def __init__(self, maxsize=128, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value, expires = self._data[key]
+            except KeyError:
+                return default
+
+            if expires is not None and expires <= monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = ttl if ttl is not None else self.ttl
+        expires = monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return self.get(key, self) is not self
+
+
+class RedisBackend(object):
+    """Adapt a Redis-like client for use as a FragmentCache backend
+
+    Any client with ``get(name)`` and ``set(name, value, ex=seconds)``
+    methods will do, e.g. ``redis.Redis``.
+
+    :param client: the client instance.
+    :param prefix: prepended to every key.
+    :param ttl: optional number of seconds after which an entry expires.
+    """
+
+    def __init__(self, client, prefix="govuk-frontend-wtf:", ttl=None):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def get(self, key, default=None):
+        value = self.client.get(self.prefix + key)
+        if value is None:
+            return default
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, value, ex=ttl if ttl is not None else self.ttl)
+
+
+class FragmentCache(object):
+    """Cache of rendered widget HTML, keyed by widget class, template and mapped params
+
+    The key includes a fingerprint of the widget's template, so one cache,
+    or one Redis instance, can be shared by apps which override templates
+    or minify them differently.
+
+    :param backend: where rendered fragments are stored. Any object with
+        ``get(key, default=None)`` and ``set(key, value)`` methods can be
+        used; defaults to an in-process :class:`LRUCache`.
+    :param maxsize: size of the default in-process backend.
+    :param ttl: entry lifetime in seconds for the default in-process backend.
+    :param bypass_submitted: don't cache fields with errors or a value,
+        whether submitted or pre-filled from ``data`` or ``obj``, which
+        rarely render the same way twice and may be personal.
+    """
+
+    def __init__(self, backend=None, maxsize=1024, ttl=300, bypass_submitted=True):
+        self.backend = backend if backend is not None else LRUCache(maxsize=maxsize, ttl=ttl)
+        self.bypass_submitted = bypass_submitted
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self._lock = Lock()
+
+    def make_key(self, widget, params, template=None):
+        """Return a stable key for a widget's mapped params, rendered with its compiled ``template``"""
+        digest = hashlib.sha256(repr(freeze(params)).encode("utf-8")).hexdigest()
+        fingerprint = get_fingerprint(template) if template is not None else ""
+        return f"{type(widget).__module__}.{type(widget).__qualname__}:{widget.template}:{fingerprint}:{digest}"
+
+    def get(self, key):
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self.backend.set(key, str(value))
+
+    def bypass(self):
+        with self._lock:
+            self.bypasses += 1
+
+    @property
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "bypasses": self.bypasses}
+
+
+def get_fingerprint(template):
+    """Return a digest of a compiled template's source and its environment's extensions
+
+    Both change the HTML a template renders for the same params, e.g. an
+    app's override of a widget template, or the ``minify`` option. It is
+    computed once for each compiled template.
+    """
+    fingerprint = _fingerprints.get(template)
+    if fingerprint is None:
+        env = template.environment
+        try:
+            source = env.loader.get_source(env, template.name)[0] if template.name else template.filename
+        except TemplateNotFound:
+            source = template.filename
+
+        parts = [source or ""] + sorted(env.extensions)
+        fingerprint = _fingerprints[template] = hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()[:16]
+
+    return fingerprint
+
+
+def has_value(data):
+    """Return whether a field's data is anything other than empty"""
+    if data is None or data is False:
+        return False
+    if isinstance(data, (str, bytes, list, tuple, set, frozenset, dict)):
+        return len(data) > 0
+    return True
+
+
+def freeze(value):
+    """Convert params to a hashable structure whose repr is stable
+
+    Markup is tagged so that it doesn't share a key with the equivalent
+    plain string, which the macros would escape.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted(((str(key), freeze(item)) for key, item in value.items())))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, Markup):
+        return ("Markup", str(value))
+    return (type(value).__name__, value if isinstance(value, (str, int, float, bool, type(None))) else repr(value))
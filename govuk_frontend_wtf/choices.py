@@ -0,0 +1,146 @@
+import inspect
+from threading import Lock
+from uuid import uuid4
+
+from wtforms.fields import RadioField, SelectField, SelectMultipleField
+from wtforms.validators import ValidationError
+
+from govuk_frontend_wtf.cache import LRUCache
+
+
+class Choices(tuple):
+    """A loaded, read only set of choices, shared between requests
+
+    Holds the choices in order for rendering, and sets of their values
+    for checking submitted data. ``token`` identifies this particular
+    load of the choices, so it changes whenever they are reloaded.
+    """
+
+    def __new__(cls, choices, key):
+        self = super().__new__(cls, choices)
+        self.token = (key, object())
+        self._indexes = {}
+        return self
+
+    def index(self, coerce):
+        """Return the set of choice values, passed through a field's coerce function"""
+        values = self._indexes.get(coerce)
+        if values is None:
+            values = self._indexes[coerce] = frozenset(
+                coerce(choice[0] if isinstance(choice, (list, tuple)) else choice) for choice in self
+            )
+
+        return values
+
+
+class ChoiceProvider(object):
+    """Load a field's choices on first use and share them between requests
+
+    Pass a provider as the ``choices`` of one of the fields below. The
+    loader is called the first time a form using it is bound, and its
+    choices are then held in ``cache`` until they expire or are evicted,
+    so they aren't looked up again on every request.
+
+    :param loader: a callable returning the choices, as ``(value, label)``
+        pairs or plain values.
+    :param key: the key the choices are held under. Providers with the
+        same key share their choices. Defaults to the loader's qualified
+        name if it's a module level function or class method, or else,
+        e.g. for a lambda or ``functools.partial``, a key unique to this
+        provider.
+    :param ttl: optional number of seconds after which the choices are
+        loaded again.
+    :param cache: where the choices are held. Defaults to an in-process
+        :class:`~govuk_frontend_wtf.cache.LRUCache` shared by every
+        provider, holding the 128 most recently used sets of choices.
+    """
+
+    cache = LRUCache(maxsize=128)
+
+    def __init__(self, loader, key=None, ttl=None, cache=None):
+        self.loader = loader
+        self.key = key or get_default_key(loader)
+        self.ttl = ttl
+        if cache is not None:
+            self.cache = cache
+        self._lock = Lock()
+
+    def __call__(self):
+        choices = self.cache.get(self.key)
+        if choices is None:
+            # Only one thread loads the choices, the rest wait for them
+            with self._lock:
+                choices = self.cache.get(self.key)
+                if choices is None:
+                    choices = Choices(self.loader(), self.key)
+                    self.cache.set(self.key, choices, ttl=self.ttl)
+
+        return choices
+
+
+def get_default_key(loader):
+    """Return the loader's qualified name, or a unique key if other loaders could share its name"""
+    module = getattr(loader, "__module__", None)
+    name = getattr(loader, "__qualname__", None)
+
+    # Lambdas and nested functions share their names, as do methods of different instances of a class
+    bound_to_instance = inspect.ismethod(loader) and not inspect.isclass(loader.__self__)
+    if module and name and "<" not in name and not bound_to_instance:
+        return f"{module}.{name}"
+
+    return f"{module or type(loader).__module__}.{name or type(loader).__qualname__}#{uuid4().hex}"
+
+
+class ProvidedChoicesMixin(object):
+    """Hold the choices from a ChoiceProvider as they are, rather than copying them
+
+    Submitted data is then checked against a set of the choice values,
+    rather than by scanning the choices.
+    """
+
+    def __init__(self, label=None, validators=None, choices=None, **kwargs):
+        super().__init__(label, validators, **kwargs)
+        if isinstance(choices, ChoiceProvider):
+            self.choices = choices()
+        elif callable(choices):
+            self.choices = list(choices())
+        elif choices is not None:
+            self.choices = choices if isinstance(choices, dict) else list(choices)
+
+    def pre_validate(self, form):
+        if not isinstance(self.choices, Choices):
+            return super().pre_validate(form)
+
+        if self.validate_choice and self.data not in self.choices.index(self.coerce):
+            raise ValidationError(self.gettext("Not a valid choice."))
+
+
+class ProvidedSelectField(ProvidedChoicesMixin, SelectField):
+    """A SelectField which accepts a ChoiceProvider as its choices"""
+
+
+class ProvidedRadioField(ProvidedChoicesMixin, RadioField):
+    """A RadioField which accepts a ChoiceProvider as its choices"""
+
+
+class ProvidedSelectMultipleField(ProvidedChoicesMixin, SelectMultipleField):
+    """A SelectMultipleField which accepts a ChoiceProvider as its choices"""
+
+    def pre_validate(self, form):
+        if not isinstance(self.choices, Choices):
+            return super().pre_validate(form)
+
+        if not self.validate_choice or not self.data:
+            return
+
+        values = self.choices.index(self.coerce)
+        unacceptable = [str(data) for data in set(self.data) if data not in values]
+        if unacceptable:
+            raise ValidationError(
+                self.ngettext(
+                    "'%(value)s' is not a valid choice for this field.",
+                    "'%(value)s' are not valid choices for this field.",
+                    len(unacceptable),
+                )
+                % dict(value="', '".join(unacceptable))
+            )
@@ -0,0 +1,41 @@
+import sys
+
+from flask import current_app, g, has_app_context
+
+
+def get_quart():
+    """Return the quart module if it has been imported and has an active app context"""
+    quart = sys.modules.get("quart")
+    if quart is not None and quart.has_app_context():
+        return quart
+
+    return None
+
+
+def get_app():
+    """Return the current app, which may be a Quart app
+
+    Quart keeps its own context, so Flask's proxies aren't bound while
+    handling a Quart request.
+    """
+    if not has_app_context():
+        quart = get_quart()
+        if quart is not None:
+            return quart.current_app._get_current_object()
+
+    return current_app._get_current_object()
+
+
+def get_g():
+    """Return the app context globals of the current, possibly Quart, app"""
+    if not has_app_context():
+        quart = get_quart()
+        if quart is not None:
+            return quart.g._get_current_object()
+
+    return g._get_current_object()
+
+
+def get_settings(app=None):
+    """Return the options the current app registered WTFormsHelpers with"""
+    return (app or get_app()).extensions.get("govuk_frontend_wtf", {})
@@ -1,7 +1,89 @@
-from flask import render_template
-from markupsafe import Markup
+from functools import lru_cache
+from inspect import isawaitable
+from time import perf_counter
+from weakref import WeakKeyDictionary
 
-from govuk_frontend_wtf.main import merger
+from flask import Flask, render_template
+from flask.signals import before_render_template, template_rendered
+from markupsafe import Markup, escape
+
+from govuk_frontend_wtf.cache import has_value
+from govuk_frontend_wtf.globals import get_app, get_g, get_quart, get_settings
+from govuk_frontend_wtf.main import merge_params
+
+# Compiled widget templates, held per Jinja environment and keyed by template name
+_template_cache = WeakKeyDictionary()
+
+
+def escape_text(text):
+    """Return a label, hint or legend's text pre-escaped as Markup
+
+    The govuk macros output text params with autoescaping, which leaves
+    Markup as it is, so the rendered HTML is unchanged but the text isn't
+    escaped again on every render. Anything other than a string, such as
+    a lazily translated string, is returned as-is so that it's still
+    evaluated at render time.
+    """
+    if isinstance(text, str):
+        return escape(text)
+
+    return text
+
+
+@lru_cache(maxsize=4096)
+def _escape_choice(text):
+    return escape(text)
+
+
+def escape_choice(text):
+    """As escape_text, for choice labels, holding the most recently used in a bounded cache"""
+    # Markup compares equal to the string it wraps, so only plain strings are cached
+    if type(text) is str:
+        return _escape_choice(text)
+
+    return escape_text(text)
+
+
+def get_render_context():
+    """Return the template context shared by widgets in fast render mode
+
+    Context processors are run on the first widget render of each app
+    context (i.e. each request) and the result is reused by every
+    subsequent widget render, rather than running them once per field.
+    """
+    g = get_g()
+    if "_govuk_frontend_wtf_context" not in g:
+        context = {}
+        get_app().update_template_context(context)
+        g._govuk_frontend_wtf_context = context
+
+    return g._govuk_frontend_wtf_context
+
+
+async def get_render_context_async():
+    """As get_render_context, for Quart whose update_template_context is a coroutine"""
+    g = get_g()
+    if "_govuk_frontend_wtf_context" not in g:
+        context = {}
+        result = get_app().update_template_context(context)
+        if isawaitable(result):
+            await result
+        g._govuk_frontend_wtf_context = context
+
+    return g._govuk_frontend_wtf_context
+
+
+async def render_template_async(app, template, context):
+    """Render a template in a Flask app's async Jinja environment
+
+    Mirrors flask.render_template, which would call the synchronous
+    Template.render and so can't be used once enable_async is set.
+    """
+    app.update_template_context(context)
+    before_render_template.send(app, _async_wrapper=app.ensure_sync, template=template, context=context)
+    html = await template.render_async(context)
+    template_rendered.send(app, _async_wrapper=app.ensure_sync, template=template, context=context)
+    return html
 
 
 class GovFormBase(object):
@@ -15,7 +97,69 @@ class GovFormBase(object):
     """
 
     def __call__(self, field, **kwargs):
-        return self.render(self.map_gov_params(field, **kwargs))
+        # render_form maps every field first, then renders them all together
+        if kwargs.pop("_gov_map_only", False):
+            return self.map_gov_params(field, **kwargs)
+
+        app = get_app()
+        settings = get_settings(app)
+
+        if app.jinja_env.is_async:
+            return self.call_async(settings, field, **kwargs)
+
+        instrumentation = settings.get("instrumentation")
+        if instrumentation is not None:
+            return self.call_instrumented(instrumentation, settings, field, **kwargs)
+
+        return self.render_field(settings, field, self.map_gov_params(field, **kwargs))
+
+    def call_instrumented(self, instrumentation, settings, field, **kwargs):
+        """Map and render the field, recording how long each step takes"""
+        start = perf_counter()
+        params = self.map_gov_params(field, **kwargs)
+        mapped = perf_counter()
+        html = self.render_field(settings, field, params)
+
+        instrumentation.record(self, mapped - start, perf_counter() - mapped, len(html.encode("utf-8")))
+
+        return html
+
+    async def call_async(self, settings, field, **kwargs):
+        """Map and render the field in an async Jinja environment
+
+        The template is rendered with Template.render_async, so this
+        returns a coroutine which the calling template awaits.
+        """
+        start = perf_counter()
+        params = self.map_gov_params(field, **kwargs)
+        mapped = perf_counter()
+        html = await self.render_field_async(settings, field, params)
+
+        instrumentation = settings.get("instrumentation")
+        if instrumentation is not None:
+            instrumentation.record(self, mapped - start, perf_counter() - mapped, len(html.encode("utf-8")))
+
+        return html
+
+    def render_field(self, settings, field, params):
+        fragment_cache = settings.get("fragment_cache")
+        if fragment_cache is None:
+            return self.render(params)
+
+        return self.render_cached(fragment_cache, field, params)
+
+    async def render_field_async(self, settings, field, params):
+        fragment_cache = settings.get("fragment_cache")
+        key = self.get_fragment_key(fragment_cache, field, params) if fragment_cache is not None else None
+        if key is None:
+            return await self.render_async(params)
+
+        html = fragment_cache.get(key)
+        if html is None:
+            html = await self.render_async(params)
+            fragment_cache.set(key, html)
+
+        return Markup(html)
 
     def map_gov_params(self, field, **kwargs):
         """Map WTForms' html params to govuk macros
@@ -23,12 +167,14 @@ class GovFormBase(object):
         Taking WTForms' output, we need to map it to a params dict
         which matches the structure that the govuk macros are expecting
         """
+        static_params = self.get_static_params(field)
+
         params = {
             "id": kwargs["id"],
             "name": field.name,
-            "label": {"text": field.label.text},
+            "label": static_params["label"],
             "attributes": {},
-            "hint": {"text": field.description} if field.description else None,
+            "hint": static_params["hint"],
         }
 
         if "value" in kwargs:
@@ -68,15 +214,151 @@ class GovFormBase(object):
 
         return params
 
+    def build_static_params(self, field):
+        """Build the params which only depend on the field's definition
+
+        These are shared between renders, either for the lifetime of the
+        bound field or, with RenderPlanMixin, of the form class, so they
+        must be treated as read only once built. Their text is escaped
+        here, once, rather than by the macros on each render.
+        """
+        return {
+            "label": {"text": escape_text(field.label.text)},
+            "hint": {"text": escape_text(field.description)} if field.description else None,
+        }
+
+    def get_static_params(self, field):
+        """Return the static params for this widget, building them on first use
+
+        They're held on the bound field along with the label text and
+        description they were built from, and built again if either has
+        been changed since. Params from a RenderPlanMixin form's plan are
+        held without them, so are always used as they are.
+        """
+        static_params = getattr(field, "_gov_static_params", None)
+
+        if (
+            static_params is None
+            or static_params[0] is not type(self)
+            or (
+                len(static_params) > 2
+                and (static_params[2] is not field.label.text or static_params[3] is not field.description)
+            )
+        ):
+            static_params = (type(self), self.build_static_params(field), field.label.text, field.description)
+            field._gov_static_params = static_params
+
+        return static_params[1]
+
     def merge_params(self, a, b):
-        return merger.merge(a, b)
+        return merge_params(a, b)
+
+    def get_template(self):
+        """Return the compiled template for this widget
+
+        The template is resolved through the app's Jinja loader once per
+        environment and then held, so subsequent renders skip the loader
+        lookup. Staleness is only checked when the environment has
+        auto_reload enabled.
+        """
+        env = get_app().jinja_env
+        templates = _template_cache.get(env)
+        if templates is None:
+            templates = _template_cache.setdefault(env, {})
+
+        template = templates.get(self.template)
+        if template is None or (env.auto_reload and not template.is_up_to_date):
+            template = templates[self.template] = env.get_template(self.template)
+
+        return template
+
+    def get_fragment_key(self, fragment_cache, field, params):
+        """Return the fragment cache key for a render, or None if the field has errors or a value"""
+        if fragment_cache.bypass_submitted and (
+            field.errors or getattr(field, "raw_data", None) or has_value(getattr(field, "data", None))
+        ):
+            fragment_cache.bypass()
+            return None
+
+        return fragment_cache.make_key(self, params, self.get_template())
+
+    def render_cached(self, fragment_cache, field, params):
+        """Render through the fragment cache, unless the field has errors or a value"""
+        key = self.get_fragment_key(fragment_cache, field, params)
+        if key is None:
+            return self.render(params)
+
+        html = fragment_cache.get(key)
+        if html is None:
+            html = self.render(params)
+            fragment_cache.set(key, html)
+
+        return Markup(html)
 
     def render(self, params):
-        return Markup(render_template(self.template, params=params))
+        if get_settings().get("fast_render"):
+            return Markup(self.get_template().render(get_render_context(), params=params))
+
+        return Markup(render_template(self.get_template(), params=params))
+
+    async def render_async(self, params):
+        app = get_app()
+        template = self.get_template()
+
+        if get_settings(app).get("fast_render"):
+            return Markup(await template.render_async(await get_render_context_async(), params=params))
+
+        if isinstance(app, Flask):
+            return Markup(await render_template_async(app, template, {"params": params}))
+
+        return Markup(await get_quart().render_template(template, params=params))
+
+
+class SingleFieldAdapter(object):
+    """Present a single field as an iterable yielding just that field
+
+    This lets widgets built on GovIterableBase, such as checkboxes, render
+    a single value field like a BooleanField. The attributes the widgets
+    read are held in slots; anything else is looked up on the field.
+    """
+
+    __slots__ = ("field", "id", "name", "flags", "label", "description", "errors", "raw_data")
+
+    def __init__(self, field):
+        self.field = field
+        self.id = field.id
+        self.name = field.name
+        self.flags = field.flags
+        self.label = field.label
+        self.description = field.description
+        self.errors = field.errors
+        self.raw_data = getattr(field, "raw_data", None)
+
+    def __iter__(self):
+        return iter((self.field,))
+
+    def __getattr__(self, name):
+        return getattr(self.field, name)
+
+    @property
+    def _gov_static_params(self):
+        return getattr(self.field, "_gov_static_params", None)
+
+    @_gov_static_params.setter
+    def _gov_static_params(self, value):
+        # Held on the field itself so that it's reused between renders
+        self.field._gov_static_params = value
 
 
 class GovIterableBase(GovFormBase):
+    #: Wraps the field before rendering, e.g. SingleFieldAdapter for widgets
+    #: rendering a single value field as a collection of one.
+    field_adapter = None
+
     def __call__(self, field, **kwargs):
+        if self.field_adapter is not None:
+            field = self.field_adapter(field)
+
         kwargs.setdefault("id", field.id)
 
         if "required" not in kwargs and "required" in getattr(field, "flags", []):
@@ -86,7 +368,7 @@ class GovIterableBase(GovFormBase):
 
         # This field is constructed as an iterable of subfields
         for subfield in field:
-            item = {"text": subfield.label.text, "value": subfield._value()}
+            item = {"text": escape_choice(subfield.label.text), "value": subfield._value()}
 
             if getattr(subfield, "checked", subfield.data):
                 item["checked"] = True
@@ -95,6 +377,11 @@ class GovIterableBase(GovFormBase):
 
         return super().__call__(field, **kwargs)
 
+    def build_static_params(self, field):
+        static_params = super().build_static_params(field)
+        static_params["hint"] = {"text": escape_text(field.description)}
+        return static_params
+
     def map_gov_params(self, field, **kwargs):
         """Completely override the params mapping for this input type
 
@@ -106,19 +393,22 @@ class GovIterableBase(GovFormBase):
         params = {
             "name": field.name,
             "items": kwargs["items"],
-            "hint": {"text": field.description},
+            "hint": self.get_static_params(field)["hint"],
         }
 
         # Merge in any extra params passed in from the template layer
         if "params" in kwargs:
+            extra_params = kwargs["params"]
+
             # Merge items individually as otherwise the merge will append new ones
-            if "items" in kwargs["params"]:
-                for index, item in enumerate(kwargs["params"]["items"]):
-                    item = self.merge_params(params["items"][index], item)
+            if "items" in extra_params:
+                for index, item in enumerate(extra_params["items"]):
+                    self.merge_params(params["items"][index], item)
 
-                del kwargs["params"]["items"]
+                # Left out without changing the caller's params, which may be reused
+                extra_params = {key: value for key, value in extra_params.items() if key != "items"}
 
-            params = self.merge_params(params, kwargs["params"])
+            params = self.merge_params(params, extra_params)
 
         if field.errors:
             params["errorMessage"] = {"text": field.errors[0]}
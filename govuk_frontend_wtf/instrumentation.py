@@ -0,0 +1,62 @@
+from threading import Lock
+
+from blinker import Namespace
+
+from govuk_frontend_wtf.globals import get_app, get_g
+
+_signals = Namespace()
+
+#: Sent at the end of each app context (i.e. each request) in which widgets
+#: were rendered, with the app as sender and the per-widget stats as ``stats``.
+widgets_rendered = _signals.signal("widgets-rendered")
+
+
+class Instrumentation(object):
+    """Per widget class render timings and counters
+
+    For every widget class rendered, the number of calls, the time spent
+    mapping params, the time spent rendering templates and the size of the
+    output in bytes are recorded. At the end of each request the totals
+    for that request are sent with the ``widgets_rendered`` signal and
+    passed to ``callback``, if given, then added to ``totals``.
+
+    :param callback: optional callable taking the per-request stats.
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.totals = {}
+        self._lock = Lock()
+
+    def record(self, widget, map_time, render_time, size):
+        stats = get_g().setdefault("_govuk_frontend_wtf_stats", {})
+
+        name = type(widget).__name__
+        widget_stats = stats.get(name)
+        if widget_stats is None:
+            widget_stats = stats[name] = new_stats()
+
+        widget_stats["calls"] += 1
+        widget_stats["map_time"] += map_time
+        widget_stats["render_time"] += render_time
+        widget_stats["bytes"] += size
+
+    def flush(self, exc=None):
+        """Emit the stats collected in the current app context"""
+        stats = get_g().pop("_govuk_frontend_wtf_stats", None)
+        if not stats:
+            return
+
+        widgets_rendered.send(get_app(), stats=stats)
+        if self.callback is not None:
+            self.callback(stats)
+
+        with self._lock:
+            for name, widget_stats in stats.items():
+                totals = self.totals.setdefault(name, new_stats())
+                for key, value in widget_stats.items():
+                    totals[key] += value
+
+
+def new_stats():
+    return {"calls": 0, "map_time": 0.0, "render_time": 0.0, "bytes": 0}
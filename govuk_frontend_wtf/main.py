@@ -1,4 +1,14 @@
-from deepmerge import Merger
+import os
+from inspect import isawaitable
+from time import perf_counter
+
+from flask import abort, request
+from werkzeug.datastructures import CombinedMultiDict
+from wtforms.fields import FieldList, FormField
+
+from govuk_frontend_wtf.cache import FragmentCache
+from govuk_frontend_wtf.globals import get_app
+from govuk_frontend_wtf.instrumentation import Instrumentation
 
 
 class WTFormsHelpers(object):
@@ -6,59 +16,379 @@ class WTFormsHelpers(object):
 
     Register some template helpers to allow developers to
     map WTForms elements to the GOV.UK jinja macros
+
+    :param fast_render: render widget templates directly against the app's
+        Jinja environment rather than through ``flask.render_template``.
+        Context processors then run once per request instead of once per
+        field, and the ``before_render_template``/``template_rendered``
+        signals are not sent for widget templates.
+    :param fragment_cache: cache rendered widget HTML, keyed by the widget
+        class and its mapped params. Pass ``True`` for an in-process
+        :class:`~govuk_frontend_wtf.cache.FragmentCache` with the default
+        limits, or a configured ``FragmentCache`` instance.
+    :param instrumentation: record per widget class render timings and
+        counters. Pass ``True``, or an
+        :class:`~govuk_frontend_wtf.instrumentation.Instrumentation`
+        instance to set a callback for the per-request stats.
+    :param warm_up: compile every widget template, and the govuk macro
+        templates they import, when the app is initialised rather than on
+        the first request. The number of templates and the time taken are
+        logged and recorded in ``app.extensions["govuk_frontend_wtf"]``.
+    :param compiled_templates: path to a template bundle built with the
+        ``govuk-frontend-wtf-compile`` command. If the bundle exists, the
+        templates in it are imported from it rather than compiled from
+        source; other templates load through the app's loader as before.
+        A bundle built for other Jinja options or package versions is
+        skipped with a warning, and templates the app overrides are
+        compiled from source.
+    :param minify: collapse the indentation and blank lines in the markup
+        of the widget and govuk macro templates when they're compiled,
+        leaving the content of ``<textarea>`` and ``<pre>`` elements as it
+        is. A compiled bundle must be built with ``--minify`` to match.
+    :param typeahead: the :class:`~govuk_frontend_wtf.typeahead.PrefixIndex`
+        instances searched by ``TypeaheadField`` fields. A view searching
+        them, by name, is registered at ``typeahead_url``.
+    :param typeahead_url: the URL of the typeahead view, to which the name
+        of the index is appended.
     """
 
-    def __init__(self, app=None):
+    def __init__(self, app=None, **kwargs):
         self.app = app
         if app is not None:
-            self.init_app(app)
+            self.init_app(app, **kwargs)
+
+    def init_app(
+        self,
+        app,
+        fast_render=False,
+        fragment_cache=None,
+        instrumentation=None,
+        warm_up=False,
+        compiled_templates=None,
+        minify=False,
+        typeahead=None,
+        typeahead_url="/govuk-frontend-wtf/typeahead",
+    ):
+        if fragment_cache is True:
+            fragment_cache = FragmentCache()
+
+        if instrumentation is True:
+            instrumentation = Instrumentation()
+
+        if instrumentation:
+            app.teardown_appcontext(instrumentation.flush)
 
-    def init_app(self, app):
+        app.extensions["govuk_frontend_wtf"] = {
+            "fast_render": fast_render,
+            "fragment_cache": fragment_cache or None,
+            "instrumentation": instrumentation or None,
+        }
         app.add_template_global(wtforms_errors)
+        app.add_template_global(wtforms_errors_async)
+        app.add_template_global(wtforms_stream)
+
+        # Imported here as the widgets depend on this module
+        from govuk_frontend_wtf.batch_render import render_form
+
+        app.add_template_global(render_form)
+
+        if typeahead:
+            self.add_typeahead(app, typeahead, typeahead_url)
+
+        if minify:
+            # Imported here as the widgets depend on this module
+            from govuk_frontend_wtf.minify import MinifyExtension
+
+            app.jinja_env.add_extension(MinifyExtension)
+
+        if compiled_templates is not None:
+            self.load_bundle(app, compiled_templates)
+
+        if warm_up:
+            self.warm_up(app)
+
+    def load_bundle(self, app, path):
+        """Load templates from a compiled bundle, if there is one at ``path`` which matches the app"""
+        if not os.path.exists(path):
+            app.logger.info("No compiled govuk-frontend-wtf templates at %s, compiling from source", path)
+            return
+
+        # Imported here as the widgets depend on this module
+        from govuk_frontend_wtf.bundle import BundleLoader, check_manifest, read_manifest
+
+        manifest = read_manifest(path)
+        problem = check_manifest(manifest, app.jinja_env)
+        if problem:
+            app.logger.warning("Not using the compiled govuk-frontend-wtf templates at %s, as %s", path, problem)
+            return
+
+        app.jinja_env.loader = BundleLoader(path, app.jinja_env.loader, manifest["templates"])
+
+    def add_typeahead(self, app, indexes, url):
+        """Register the view searching typeahead indexes, at ``url/<name>``"""
+        # Imported here as the widgets depend on this module
+        from govuk_frontend_wtf.typeahead import search_typeahead
+
+        app.extensions["govuk_frontend_wtf"]["typeahead"] = {index.name: index for index in indexes}
+        app.add_url_rule(url.rstrip("/") + "/<name>", "govuk_frontend_wtf_typeahead", search_typeahead)
+
+    def add_inline_validation(self, app, rule, form_class, endpoint=None):
+        """Register a view which validates and renders a single field of a form
+
+        The view accepts the form's data as a POST and the name of the field
+        to validate, e.g. ``rows-0-postcode``, in the ``field`` query
+        string argument. It responds with the field's widget markup,
+        including its error message if it failed validation. No other
+        field is validated, and neither is the CSRF token, as nothing is
+        changed by the request.
+        """
+
+        def validate_inline():
+            form = form_class(formdata=CombinedMultiDict((request.files, request.form)))
+            try:
+                owner, field = find_field(form, request.args.get("field", ""))
+            except KeyError:
+                abort(404)
+
+            # Errors validating or rendering the field aren't the client's, so aren't caught
+            return validate_owned_field(owner, field)
+
+        app.add_url_rule(
+            rule,
+            endpoint or f"govuk_frontend_wtf_validate_{form_class.__name__}",
+            validate_inline,
+            methods=["POST"],
+        )
+
+    def warm_up(self, app):
+        """Compile the widget templates for an app, returning how long it took in seconds"""
+        # Imported here as the widgets depend on this module
+        from govuk_frontend_wtf.warm_up import warm_up_templates
+
+        start = perf_counter()
+        templates = warm_up_templates(app.jinja_env)
+        elapsed = perf_counter() - start
+
+        app.extensions["govuk_frontend_wtf"]["warm_up"] = {"templates": len(templates), "time": elapsed}
+        app.logger.info("Compiled %d govuk-frontend-wtf templates in %.1fms", len(templates), elapsed * 1000)
+
+        return elapsed
+
+
+def wtforms_stream(form):
+    """Render a form, or a FormField or FieldList, one field at a time
+
+    Returns a generator yielding the markup of each field in turn, so used
+    with ``flask.stream_template`` the page is sent as it renders rather
+    than once every row of a long FieldList has been rendered. In an async
+    Jinja environment an async generator is returned instead.
+    """
+    if get_app().jinja_env.is_async:
+        return stream_fields_async(form)
+
+    return (field() for field in iter_fields(form))
+
+
+async def stream_fields_async(form):
+    for field in iter_fields(form):
+        # Fields without a GOV.UK widget, such as the CSRF token, render synchronously
+        html = field()
+        yield (await html) if isawaitable(html) else html
+
+
+def iter_fields(form):
+    """Yield the fields of a form in order, expanding FormFields and FieldLists into their subfields
+
+    FormFields and FieldLists with a GOV.UK widget of their own, such as
+    ``GovFieldList``, are yielded whole, as their widget renders their
+    subfields. ``form`` may be any iterable of fields, and anything else
+    in it is yielded as it is.
+    """
+    # Imported here as the widgets depend on this module
+    from govuk_frontend_wtf.gov_form_base import GovFormBase
+
+    stack = [iter(form)]
+    while stack:
+        for field in stack[-1]:
+            if isinstance(field, (FormField, FieldList)) and not isinstance(field.widget, GovFormBase):
+                stack.append(iter(field))
+                break
+
+            yield field
+        else:
+            stack.pop()
+
+
+def validate_field(form, name):
+    """Validate a single field of a form and return its rendered widget
 
+    The field is found by its name, including the prefixes of any FormField
+    or FieldList it's nested in, e.g. ``rows-0-address-postcode``. Only
+    that field's validators, and any inline ``validate_<field>`` method of
+    the form it belongs to, are run.
 
-def wtforms_errors(form, params={}):
-    wtforms_params = {"titleText": "There is a problem", "errorList": []}
+    :raises KeyError: if the form has no field with that name.
+    """
+    return validate_owned_field(*find_field(form, name))
+
+
+def validate_owned_field(owner, field):
+    """Validate a field of the form ``owner`` and return its rendered widget, as for validate_field"""
+    extra_validators = None
+    if owner._fields.get(field.short_name) is field:
+        inline = getattr(type(owner), f"validate_{field.short_name}", None)
+        if inline is not None:
+            extra_validators = [inline]
+
+    field.validate(owner, extra_validators=extra_validators)
+
+    return field()
+
+
+def find_field(form, name):
+    """Return the form a field belongs to and the field, found by its full name"""
+    owner, fields = form, form
+    while True:
+        for field in fields:
+            if field.name == name:
+                return owner, field
+
+            if isinstance(field, (FormField, FieldList)) and name.startswith(field.name + "-"):
+                if isinstance(field, FormField):
+                    owner = field.form
+                fields = field
+                break
+        else:
+            raise KeyError(name)
+
+
+def wtforms_errors(form, params=None):
+    wtforms_params = {
+        "titleText": "There is a problem",
+        "errorList": list(get_error_list(form)),
+    }
+
+    if params:
+        wtforms_params = merge_params(wtforms_params, params)
 
-    id_map = {}
-    for field_name in form._fields.keys():
-        field = getattr(form, field_name, None)
-        if field and hasattr(field, "id"):
-            id_map[field_name] = field.id
+    return wtforms_params
 
-    wtforms_params["errorList"] = flatten_errors(form.errors, id_map=id_map)
 
-    return merger.merge(wtforms_params, params)
+async def wtforms_errors_async(form, params=None):
+    """As wtforms_errors, as a coroutine for async views and templates
 
+    The error list is built from the form's errors without any I/O or
+    rendering, so wtforms_errors is equally safe to call from an async
+    template; this is for code which expects to await it.
+    """
+    return wtforms_errors(form, params)
+
+
+def get_error_list(form):
+    """Return the flattened error list for a form
+
+    The list is memoized on the form instance, so templates can call
+    wtforms_errors several times per request for the cost of one. It is
+    rebuilt if the form's errors have changed since, for example when the
+    form is validated again or errors are appended in a view.
+    """
+    fingerprint = get_errors_fingerprint(form)
+    memo = getattr(form, "_gov_errors_memo", None)
+
+    if memo is None or memo[0] != fingerprint:
+        memo = (fingerprint, flatten_errors(form.errors, id_map=get_id_map(form)))
+        form._gov_errors_memo = memo
+
+    return memo[1]
+
+
+def get_errors_fingerprint(form):
+    """Return a cheap snapshot of the error lists behind form.errors
+
+    Validation replaces each field's errors list, and appending to one
+    changes its length, so either shows up as a different fingerprint.
+    The lists themselves are held, so their identity can't be reused.
+    """
+    fingerprint = [form.form_errors, len(form.form_errors)]
 
-def flatten_errors(errors, prefix="", id_map={}):
+    for field in form._fields.values():
+        if isinstance(field, FormField):
+            fingerprint.append(get_errors_fingerprint(field.form))
+        else:
+            fingerprint.append(field.errors)
+            fingerprint.append(len(field.errors))
+
+    return fingerprint
+
+
+def get_id_map(form):
+    """Return a map of the form's field names to their ids
+
+    Field ids are fixed when the form is bound, so the map is built once
+    and held on the form instance.
+    """
+    id_map = getattr(form, "_gov_id_map", None)
+
+    if id_map is None:
+        id_map = {}
+        for field_name in form._fields.keys():
+            field = getattr(form, field_name, None)
+            if field and hasattr(field, "id"):
+                id_map[field_name] = field.id
+        form._gov_id_map = id_map
+
+    return id_map
+
+
+def flatten_errors(errors, prefix="", id_map=None):
     """Return list of errors from form errors."""
-    error_list = []
-    if isinstance(errors, dict):
-        for key, value in errors.items():
-            # Recurse to handle subforms.
-            if key in id_map:
-                key = id_map[key]
-            error_list += flatten_errors(value, prefix=f"{prefix}{key}-", id_map=id_map)
-    elif isinstance(errors, list) and isinstance(errors[0], dict):
-        for idx, error in enumerate(errors):
-            error_list += flatten_errors(error, prefix=f"{prefix}{idx}-", id_map=id_map)
-    elif isinstance(errors, list):
-        error_list.append({"text": errors[0], "href": "#{}".format(prefix.rstrip("-"))})
-    else:
-        error_list.append({"text": errors, "href": "#{}".format(prefix.rstrip("-"))})
-    return error_list
-
-
-merger = Merger(
-    # pass in a list of tuple, with the
-    # strategies you are looking to apply
-    # to each type.
-    [(list, ["append"]), (dict, ["merge"])],
-    # next, choose the fallback strategies,
-    # applied to all other types:
-    ["override"],
-    # finally, choose the strategies in
-    # the case where the types conflict:
-    ["override"],
-)
+    return list(iter_errors(errors, prefix=prefix, id_map=id_map))
+
+
+def iter_errors(errors, prefix="", id_map=None):
+    """Yield error summary entries from form errors, in document order
+
+    Nested errors from FormField and FieldList are walked with an explicit
+    stack rather than by recursion, so each entry is only built once.
+    """
+    if id_map is None:
+        id_map = {}
+
+    stack = [(prefix, errors)]
+    while stack:
+        prefix, errors = stack.pop()
+
+        # Push children in reverse so they are popped in document order
+        if isinstance(errors, dict):
+            for key in reversed(errors):
+                stack.append((f"{prefix}{id_map.get(key, key)}-", errors[key]))
+        elif isinstance(errors, list) and isinstance(errors[0], dict):
+            for index in range(len(errors) - 1, -1, -1):
+                stack.append((f"{prefix}{index}-", errors[index]))
+        elif isinstance(errors, list):
+            yield {"text": errors[0], "href": "#{}".format(prefix.rstrip("-"))}
+        else:
+            yield {"text": errors, "href": "#{}".format(prefix.rstrip("-"))}
+
+
+def merge_params(base, nxt):
+    """Merge nxt into base in place and return base
+
+    Specialised for the shape of the govuk macro params: dicts are merged
+    recursively, lists are appended and any other value (including a
+    change of type) overrides the existing one. Values from nxt that are
+    not already present in base are used as-is rather than copied.
+
+    Only base itself is modified. Nested dicts in base may be shared
+    between renders, so they are copied before anything is merged in.
+    """
+    for key, value in nxt.items():
+        if key in base:
+            existing = base[key]
+            if isinstance(existing, dict) and isinstance(value, dict):
+                value = merge_params(dict(existing), value)
+            elif isinstance(existing, list) and isinstance(value, list):
+                value = existing + value
+        base[key] = value
+
+    return base
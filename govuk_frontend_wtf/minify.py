@@ -0,0 +1,105 @@
+import re
+
+from jinja2.ext import Extension
+from jinja2.lexer import Token
+
+# A run of whitespace spanning lines, i.e. indentation and blank lines
+LINE_BREAKS = re.compile(r"[ \t\r\f\v]*\n\s*")
+
+# As lstrip_blocks, the indentation before a block tag starting a line
+LSTRIP_BLOCK = re.compile(r"(?<=\n)[ \t]+\Z")
+
+# As trim_blocks, the line break following a block tag
+TRIM_BLOCK = re.compile(r"\A\r?\n")
+
+# Elements whose content is rendered as written
+PRESERVE = re.compile(r"<(textarea|pre)\b|</(textarea|pre)\s*>", re.IGNORECASE)
+
+
+class MinifyExtension(Extension):
+    """Strip the insignificant whitespace of the widget and govuk macro templates as they're compiled
+
+    The templates' own markup is treated as if ``trim_blocks`` and
+    ``lstrip_blocks`` were set, as GOV.UK Frontend renders its Nunjucks
+    templates, and every remaining run of whitespace spanning lines is
+    replaced with a single newline, which browsers treat the same as the
+    original run. The content of ``<textarea>`` and ``<pre>`` elements is
+    left as it is, as are values rendered into the templates and any other
+    template.
+
+    As this happens when a template is compiled, rendering costs nothing
+    extra, and compiled bundles must be built with ``--minify`` to match.
+    """
+
+    #: Names of the templates to minify start with one of these
+    prefixes = ("govuk_frontend_wtf/", "govuk_frontend_jinja/")
+
+    def filter_stream(self, stream):
+        if not (stream.name or "").startswith(self.prefixes):
+            return stream
+
+        return self.minify_stream(stream)
+
+    def minify_stream(self, stream):
+        preserving = None
+        previous = None
+
+        # Each data token is held until the next token shows whether a block tag follows it
+        data = None
+        after_block = False
+
+        for token in stream:
+            if token.type == "data":
+                data, after_block = token, previous == "block_end"
+                previous = token.type
+                continue
+
+            if data is not None:
+                value, preserving = self.minify_data(data.value, preserving, after_block, token.type == "block_begin")
+                if value:
+                    yield Token(data.lineno, data.type, value)
+                data = None
+
+            previous = token.type
+            yield token
+
+        if data is not None:
+            value, preserving = self.minify_data(data.value, preserving, after_block, False)
+            if value:
+                yield Token(data.lineno, data.type, value)
+
+    def minify_data(self, value, preserving, after_block, before_block):
+        if preserving is None:
+            if before_block:
+                value = LSTRIP_BLOCK.sub("", value)
+            if after_block:
+                value = TRIM_BLOCK.sub("", value)
+
+        return minify(value, preserving)
+
+
+def minify(html, preserving=None):
+    """Collapse the whitespace spanning lines in some markup, other than in textarea and pre elements
+
+    :param preserving: the name of the element, ``textarea`` or ``pre``,
+        that the markup starts in, if any.
+    :returns: the minified markup and the name of the element it ends in.
+    """
+    parts = []
+    position = 0
+
+    for match in PRESERVE.finditer(html):
+        opening, closing = match.group(1), match.group(2)
+        if preserving is None and opening:
+            parts.append(LINE_BREAKS.sub("\n", html[position : match.start()]))
+            position = match.start()
+            preserving = opening.lower()
+        elif preserving is not None and closing and closing.lower() == preserving:
+            parts.append(html[position : match.end()])
+            position = match.end()
+            preserving = None
+
+    rest = html[position:]
+    parts.append(rest if preserving is not None else LINE_BREAKS.sub("\n", rest))
+
+    return "".join(parts), preserving
@@ -0,0 +1,225 @@
+"""Offline bulk rendering of pre-filled forms
+
+Binds a form class to each of a stream of data records and renders it
+with the GOV.UK widgets, across a pool of worker processes, writing each
+page to its own file. Each worker creates the app and pushes an app
+context once, then renders every record it's given in that context. Run
+it with::
+
+    govuk-frontend-wtf-prerender myapp.forms:CaseForm cases.jsonl --output pages/
+
+Records are JSON, JSON Lines or YAML mappings. The form data is read
+from ``data``, or ``request.data`` as in the test fixtures, with a list
+for each field that has several values. An optional ``id`` names the
+output file, with a numbered suffix if an earlier record has already
+taken the name. Any other keys are passed to the template as
+``record``.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import warnings
+from multiprocessing import Pool
+from time import perf_counter
+
+from flask import Flask, render_template
+from jinja2 import PackageLoader, PrefixLoader
+from werkzeug.datastructures import MultiDict
+from werkzeug.utils import secure_filename
+
+from govuk_frontend_wtf.main import WTFormsHelpers
+
+DEFAULT_TEMPLATE = "{{ render_form(form) }}"
+
+# The worker process' app, form class and template, set up by init_worker
+_worker = None
+
+
+def import_string(name):
+    """Import ``module:attribute``"""
+    module, _, attribute = name.partition(":")
+    if not attribute:
+        raise ValueError(f"{name!r} should be given as module:attribute")
+
+    return getattr(importlib.import_module(module), attribute)
+
+
+def create_app():
+    """Return an app which loads the govuk and widget templates, as the README configures Flask to"""
+    app = Flask(__name__)
+    app.jinja_loader = PrefixLoader(
+        {
+            "govuk_frontend_jinja": PackageLoader("govuk_frontend_jinja"),
+            "govuk_frontend_wtf": PackageLoader("govuk_frontend_wtf"),
+        }
+    )
+    WTFormsHelpers(app, fast_render=True)
+
+    return app
+
+
+def iter_records(path):
+    """Yield the records in a JSON, JSON Lines or YAML file, or from stdin for ``-`` (JSON Lines)"""
+    extension = os.path.splitext(path)[1].lower()
+
+    if path == "-" or extension in (".jsonl", ".ndjson"):
+        stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        try:
+            for line in stream:
+                if line.strip():
+                    yield json.loads(line)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+    elif extension in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise RuntimeError("Reading YAML records requires PyYAML: pip install pyyaml") from None
+
+        with open(path, encoding="utf-8") as stream:
+            for document in yaml.safe_load_all(stream):
+                yield from document if isinstance(document, list) else [document]
+
+    else:
+        with open(path, encoding="utf-8") as stream:
+            document = json.load(stream)
+        yield from document if isinstance(document, list) else [document]
+
+
+def get_formdata(record):
+    """Return a record's form data as a MultiDict"""
+    data = record.get("data")
+    if data is None:
+        data = record.get("request", {}).get("data", {})
+
+    formdata = MultiDict()
+    for key, value in data.items():
+        for item in value if isinstance(value, list) else [value]:
+            formdata.add(key, "" if item is None else str(item))
+
+    return formdata
+
+
+def get_filename(record, number):
+    """Return the output file name for a record, from its id or otherwise its number"""
+    name = secure_filename(str(record.get("id", "")))
+    return f"{name or f'{number:06d}'}.html"
+
+
+def iter_tasks(records):
+    """Yield each record with a file name no earlier record has, numbering any that would be taken
+
+    Names are given out here, in the parent process and in the order of the
+    records, so which record gets a name doesn't depend on which worker
+    renders it first.
+    """
+    taken = set()
+
+    for number, record in enumerate(records, 1):
+        filename = get_filename(record, number)
+        if filename in taken:
+            stem = filename[: -len(".html")]
+            suffix = 2
+            while f"{stem}-{suffix}.html" in taken:
+                suffix += 1
+
+            warnings.warn(f"Record {number} is written to {stem}-{suffix}.html, as {filename} is taken", stacklevel=2)
+            filename = f"{stem}-{suffix}.html"
+
+        taken.add(filename)
+        yield filename, record
+
+
+def init_worker(form, template, app_factory, output, validate):
+    """Set up a worker process, creating its app and pushing an app context for all of its renders"""
+    global _worker
+
+    app = import_string(app_factory)() if app_factory else create_app()
+    app.app_context().push()
+
+    _worker = {
+        "form_class": import_string(form),
+        "template": app.jinja_env.get_template(template) if template else app.jinja_env.from_string(DEFAULT_TEMPLATE),
+        "output": output,
+        "validate": validate,
+    }
+
+
+def render_record(task):
+    """Bind and render a single record, writing the page to the output directory"""
+    filename, record = task
+
+    # CSRF tokens depend on a session, and mean nothing on a static page
+    form = _worker["form_class"](formdata=get_formdata(record), meta={"csrf": False})
+    if _worker["validate"]:
+        form.validate()
+
+    html = render_template(_worker["template"], form=form, record=record)
+
+    path = os.path.join(_worker["output"], filename)
+    with open(path, "w", encoding="utf-8") as stream:
+        stream.write(html)
+
+    return path
+
+
+def prerender(form, records, output, template=None, app_factory=None, processes=None, validate=False, chunksize=16):
+    """Render a form for every record, across a pool of processes, returning the paths written
+
+    :param form: the form class, as ``module:Class``.
+    :param records: an iterable of records.
+    :param output: the directory to write the pages to.
+    :param template: the name of a template to render each page with,
+        given ``form`` and ``record``, loaded through the app's loader.
+        Defaults to rendering just the form's fields.
+    :param app_factory: a function creating the app to render with, as
+        ``module:function``. Defaults to an app configured for the widgets
+        with fast rendering.
+    :param processes: the number of worker processes, defaulting to the
+        number of CPUs.
+    :param validate: validate each form, so that errors are shown.
+    :param chunksize: the number of records sent to a worker at a time.
+    """
+    os.makedirs(output, exist_ok=True)
+
+    with Pool(processes, init_worker, (form, template, app_factory, output, validate)) as pool:
+        return list(pool.imap_unordered(render_record, iter_tasks(records), chunksize=chunksize))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render pre-filled GOV.UK forms in bulk")
+    parser.add_argument("form", help="the form class, as module:Class")
+    parser.add_argument("records", nargs="+", help="JSON, JSON Lines or YAML files of records, or - for stdin")
+    parser.add_argument("--output", "-o", required=True, help="directory to write the pages to")
+    parser.add_argument("--template", help="template to render each page with, given form and record")
+    parser.add_argument("--app", dest="app_factory", metavar="MODULE:FUNCTION", help="function creating the app")
+    parser.add_argument("--processes", "-j", type=int, help="number of worker processes, defaults to the CPU count")
+    parser.add_argument("--chunksize", type=int, default=16, help="records sent to a worker at a time")
+    parser.add_argument("--validate", action="store_true", help="validate each form, showing any errors")
+    args = parser.parse_args(argv)
+
+    records = (record for path in args.records for record in iter_records(path))
+
+    start = perf_counter()
+    paths = prerender(
+        args.form,
+        records,
+        args.output,
+        template=args.template,
+        app_factory=args.app_factory,
+        processes=args.processes,
+        validate=args.validate,
+        chunksize=args.chunksize,
+    )
+    elapsed = perf_counter() - start
+
+    print(f"Rendered {len(paths)} pages to {args.output} in {elapsed:.1f}s ({len(paths) / elapsed:.0f} pages/s)")
+
+
+if __name__ == "__main__":
+    main()
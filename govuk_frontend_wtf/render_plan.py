@@ -0,0 +1,44 @@
+from govuk_frontend_wtf.gov_form_base import GovFormBase
+
+
+class RenderPlanMixin(object):
+    """Build each widget's static params once per form class
+
+    Mix this in ahead of ``FlaskForm`` (or any WTForms ``Form``) to opt in:
+
+        class ExampleForm(RenderPlanMixin, FlaskForm):
+            ...
+
+    The first time the form is instantiated, the label, hint and fieldset
+    legend params for every GOV.UK widget on the form are built and held
+    on the class as its render plan. Every later instance shares them, so
+    rendering a field only has to map its value, errors and checked or
+    selected state.
+
+    Only use this on forms whose labels and descriptions are fixed in the
+    class definition. Changes made to them on a bound form will not be
+    picked up.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        plan = self.get_render_plan()
+        for name, static_params in plan.items():
+            field = self._fields[name]
+            field._gov_static_params = (type(field.widget), static_params)
+
+    def get_render_plan(self):
+        """Return the render plan for this form's class, building it on first use"""
+        cls = type(self)
+
+        # Look only at this class, so that subclasses get a plan of their own
+        plan = cls.__dict__.get("_gov_render_plan")
+        if plan is None:
+            plan = {}
+            for name, field in self._fields.items():
+                if isinstance(field.widget, GovFormBase):
+                    plan[name] = field.widget.build_static_params(field)
+            cls._gov_render_plan = plan
+
+        return plan
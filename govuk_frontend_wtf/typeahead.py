@@ -0,0 +1,154 @@
+from bisect import bisect_left
+from threading import Lock
+
+from flask import abort, jsonify, request
+from wtforms.fields import SelectField
+from wtforms.validators import ValidationError
+
+from govuk_frontend_wtf.globals import get_settings
+from govuk_frontend_wtf.wtforms_widgets import GovTypeahead
+
+
+def normalise(text):
+    return " ".join(str(text).casefold().split())
+
+
+class PrefixIndex(object):
+    """An index of choices by the start of each word of their labels
+
+    Built once, the first time it's searched or checked, and then shared
+    by every request. A search for ``"plym"`` matches ``"Plymouth"`` and
+    ``"1 Plymouth Road"``, and a search for ``"1 plym"`` only the latter.
+
+    :param name: identifies the index in the typeahead endpoint's URL.
+    :param choices: an iterable of ``(value, label)`` pairs, or a callable
+        returning one, which is called when the index is built.
+    :param max_results: the most matches a search returns, however many
+        are asked for.
+    :param min_length: the shortest query that's searched for. Shorter
+        queries match nothing.
+    """
+
+    def __init__(self, name, choices, max_results=20, min_length=2):
+        self.name = name
+        self.choices = choices
+        self.max_results = max_results
+        self.min_length = min_length
+        self._labels = None
+        self._keys = None
+        self._values = None
+        self._lock = Lock()
+
+    def build(self):
+        """Build the index, if it hasn't been already"""
+        if self._labels is not None:
+            return
+
+        with self._lock:
+            if self._labels is not None:
+                return
+
+            choices = self.choices() if callable(self.choices) else self.choices
+            labels = {}
+            entries = []
+            for value, label in choices:
+                labels[value] = label
+
+                # Index every suffix of the label starting at a word
+                text = normalise(label)
+                start = 0
+                while start != -1:
+                    entries.append((text[start:], value))
+                    start = text.find(" ", start)
+                    if start != -1:
+                        start += 1
+
+            entries.sort(key=lambda entry: entry[0])
+            self._keys = [key for key, value in entries]
+            self._values = [value for key, value in entries]
+            self._labels = labels
+
+    def search(self, query, limit=None):
+        """Return up to ``limit`` ``(value, label)`` pairs whose labels have a word starting with ``query``"""
+        query = normalise(query)
+        if len(query) < self.min_length:
+            return []
+
+        self.build()
+        limit = min(limit or self.max_results, self.max_results)
+
+        results = {}
+        position = bisect_left(self._keys, query)
+        while position < len(self._keys) and len(results) < limit and self._keys[position].startswith(query):
+            value = self._values[position]
+            results.setdefault(value, self._labels[value])
+            position += 1
+
+        return list(results.items())
+
+    def get_label(self, value):
+        """Return the label of a value, or None if it isn't in the index"""
+        self.build()
+        try:
+            return self._labels.get(value)
+        except TypeError:
+            return None
+
+    def __contains__(self, value):
+        self.build()
+        try:
+            return value in self._labels
+        except TypeError:
+            return False
+
+    def __len__(self):
+        self.build()
+        return len(self._labels)
+
+
+class TypeaheadField(SelectField):
+    """A select field whose choices are held in a :class:`PrefixIndex`
+
+    Only the selected choice is rendered, by the :class:`GovTypeahead`
+    widget, and the rest are searched from the typeahead endpoint as the
+    user types. Submitted values are validated by looking them up in the
+    index rather than by scanning a list of choices.
+
+    :param index: the :class:`PrefixIndex` of the field's choices, which
+        must also be passed to ``WTFormsHelpers`` to register its endpoint.
+    """
+
+    widget = GovTypeahead()
+
+    def __init__(self, label=None, validators=None, index=None, **kwargs):
+        super().__init__(label, validators, **kwargs)
+        self.index = index
+
+    def iter_choices(self):
+        yield ("", "", self.data is None or self.data == "", {})
+
+        label = self.index.get_label(self.data)
+        if label is not None:
+            yield (self.data, label, True, {})
+
+    def has_groups(self):
+        return False
+
+    def pre_validate(self, form):
+        if self.validate_choice and self.data not in self.index:
+            raise ValidationError(self.gettext("Not a valid choice."))
+
+
+def search_typeahead(name):
+    """Respond with the choices of the named index matching the ``query`` argument, as JSON
+
+    The number of results is bounded by the index's ``max_results``, and
+    by the ``limit`` argument if that's lower.
+    """
+    index = get_settings().get("typeahead", {}).get(name)
+    if index is None:
+        abort(404)
+
+    results = index.search(request.args.get("query", ""), request.args.get("limit", type=int))
+
+    return jsonify([{"value": value, "text": label} for value, label in results])
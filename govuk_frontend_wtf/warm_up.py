@@ -0,0 +1,51 @@
+from jinja2 import meta
+
+from govuk_frontend_wtf import wtforms_widgets  # noqa: F401 - registers the built in widget classes
+from govuk_frontend_wtf.gov_form_base import GovFormBase, _template_cache
+
+
+def iter_widget_templates():
+    """Yield the template names of every GovFormBase widget class defined so far"""
+    classes = [GovFormBase]
+    while classes:
+        cls = classes.pop()
+        classes.extend(cls.__subclasses__())
+        template = getattr(cls, "template", None)
+        if template:
+            yield template
+
+
+def find_templates(env, names):
+    """Return the given template names along with every template they import or include"""
+    found = set()
+
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name in found:
+            continue
+
+        found.add(name)
+        source = env.loader.get_source(env, name)[0]
+        pending.extend(ref for ref in meta.find_referenced_templates(env.parse(source)) if ref is not None)
+
+    return found
+
+
+def warm_up_templates(env):
+    """Compile every widget template and the macro templates they import
+
+    Widget templates are held in the per-environment cache used by
+    GovFormBase.get_template, and the imported macro templates in the
+    environment's own cache, so the first request doesn't compile them.
+
+    :returns: a dict of the compiled templates, keyed by name.
+    """
+    widget_templates = set(iter_widget_templates())
+    templates = {name: env.get_template(name) for name in sorted(find_templates(env, widget_templates))}
+
+    cache = _template_cache.setdefault(env, {})
+    for name in widget_templates:
+        cache[name] = templates[name]
+
+    return templates
@@ -1,6 +1,16 @@
+from inspect import isawaitable
+from time import perf_counter
+
+from flask import url_for
+from markupsafe import Markup
+from wtforms.fields import FormField
 from wtforms.widgets.core import FileInput, Input, PasswordInput, Select, SubmitInput, TextArea, TextInput
 
-from govuk_frontend_wtf.gov_form_base import GovFormBase, GovIterableBase
+from govuk_frontend_wtf.cache import LRUCache
+from govuk_frontend_wtf.choices import Choices
+from govuk_frontend_wtf.globals import get_app, get_settings
+from govuk_frontend_wtf.gov_form_base import GovFormBase, GovIterableBase, SingleFieldAdapter, escape_choice
+from govuk_frontend_wtf.main import iter_fields
 
 """Lifted from WTForms and modified to generate GOV.UK markup
 
@@ -60,51 +70,28 @@ class GovCheckboxesInput(GovIterableBase):
     template = "govuk_frontend_wtf/checkboxes.html"
     input_type = "checkbox"
 
+    def build_static_params(self, field):
+        static_params = super().build_static_params(field)
+        static_params["fieldset"] = {
+            "legend": {
+                "text": static_params["label"]["text"],
+            },
+        }
+        return static_params
+
     def map_gov_params(self, field, **kwargs):
         params = super().map_gov_params(field, **kwargs)
-        params.setdefault(
-            "fieldset",
-            {
-                "legend": {
-                    "text": field.label.text,
-                },
-            },
-        )
+        params.setdefault("fieldset", self.get_static_params(field)["fieldset"])
         return params
 
 
 class GovCheckboxInput(GovCheckboxesInput):
     """Render a single checkbox (i.e. a WTForms BooleanField)."""
 
-    def __call__(self, field, **kwargs):
-        # We are subclassing GovCheckboxesInput which expects
-        # the field to be an iterable yielding each checkbox "subfield"
-        # In order to make our single BooleanField comply with this, we
-        # need to provide it with a similar construct, but which only
-        # yields a single checkbox
-        class IterableField(object):
-            def __init__(self, field):
-                self.field = field
-                self.max = 1
-
-            def __iter__(self):
-                self.index = 0
-                return self
-
-            def __next__(self):
-                if self.index < self.max:
-                    self.index += 1
-
-                    return self.field
-                else:
-                    raise StopIteration
-
-            def __getattr__(self, name):
-                return getattr(self.field, name)
-
-        field_group = IterableField(field)
-
-        return super().__call__(field_group, **kwargs)
+    # We are subclassing GovCheckboxesInput which expects the field to be
+    # an iterable yielding each checkbox "subfield", so our single
+    # BooleanField is wrapped to yield just itself
+    field_adapter = SingleFieldAdapter
 
     def map_gov_params(self, field, **kwargs):
         params = super().map_gov_params(field, **kwargs)
@@ -121,14 +108,16 @@ class GovRadioInput(GovIterableBase):
     template = "govuk_frontend_wtf/radios.html"
     input_type = "radio"
 
+    def build_static_params(self, field):
+        static_params = super().build_static_params(field)
+        static_params["fieldset"] = {
+            "legend": {"text": static_params["label"]["text"]},
+        }
+        return static_params
+
     def map_gov_params(self, field, **kwargs):
         params = super().map_gov_params(field, **kwargs)
-        params.setdefault(
-            "fieldset",
-            {
-                "legend": {"text": field.label.text},
-            },
-        )
+        params.setdefault("fieldset", self.get_static_params(field)["fieldset"])
         return params
 
 
@@ -143,6 +132,13 @@ class GovDateInput(GovFormBase):
 
     template = "govuk_frontend_wtf/date.html"
 
+    #: The label, id suffix and classes without and with errors of each input
+    date_items = (
+        ("Day", "-day", "govuk-input--width-2", "govuk-input--width-2 govuk-input--error"),
+        ("Month", "-month", "govuk-input--width-2", "govuk-input--width-2 govuk-input--error"),
+        ("Year", "-year", "govuk-input--width-4", "govuk-input--width-4 govuk-input--error"),
+    )
+
     def __call__(self, field, **kwargs):
         kwargs.setdefault("id", field.id)
         if "value" not in kwargs:
@@ -151,59 +147,33 @@ class GovDateInput(GovFormBase):
             kwargs["required"] = True
         return super().__call__(field, **kwargs)
 
+    def build_static_params(self, field):
+        static_params = super().build_static_params(field)
+        static_params["fieldset"] = {
+            "legend": {"text": static_params["label"]["text"]},
+        }
+        return static_params
+
     def map_gov_params(self, field, **kwargs):
         params = super().map_gov_params(field, **kwargs)
         day, month, year = [None] * 3
-        if field.raw_data is not None:
+        if field.raw_data:
             day, month, year = field.raw_data
         elif field.data:
             day, month, year = field.data.strftime("%d %m %Y").split(" ")
 
-        params.setdefault(
-            "fieldset",
-            {
-                "legend": {"text": field.label.text},
-            },
-        )
+        params.setdefault("fieldset", self.get_static_params(field)["fieldset"])
         params.setdefault(
             "items",
             [
                 {
-                    "label": "Day",
-                    "id": "{}-day".format(field.name),
-                    "name": field.name,
-                    "classes": " ".join(
-                        [
-                            "govuk-input--width-2",
-                            "govuk-input--error" if field.errors else "",
-                        ]
-                    ).strip(),
-                    "value": day,
-                },
-                {
-                    "label": "Month",
-                    "id": "{}-month".format(field.name),
+                    "label": label,
+                    "id": field.name + suffix,
                     "name": field.name,
-                    "classes": " ".join(
-                        [
-                            "govuk-input--width-2",
-                            "govuk-input--error" if field.errors else "",
-                        ]
-                    ).strip(),
-                    "value": month,
-                },
-                {
-                    "label": "Year",
-                    "id": "{}-year".format(field.name),
-                    "name": field.name,
-                    "classes": " ".join(
-                        [
-                            "govuk-input--width-4",
-                            "govuk-input--error" if field.errors else "",
-                        ]
-                    ).strip(),
-                    "value": year,
-                },
+                    "classes": error_classes if field.errors else classes,
+                    "value": value,
+                }
+                for (label, suffix, classes, error_classes), value in zip(self.date_items, (day, month, year))
             ],
         )
         return params
@@ -242,7 +212,7 @@ class GovSubmitInput(GovInput, SubmitInput):
     def map_gov_params(self, field, **kwargs):
         params = super().map_gov_params(field, **kwargs)
 
-        params.setdefault("text", field.label.text)
+        params.setdefault("text", self.get_static_params(field)["label"]["text"])
         params.setdefault("element", "button")
 
         return params
@@ -291,9 +261,18 @@ class GovSelect(GovFormBase, Select):
     The field must provide an `iter_choices()` method which the widget will
     call on rendering; this method must yield tuples of
     `(value, label, selected)`.
+
+    For selects with at least `option_cache_min_choices` choices, the
+    rendered `<option>` markup is cached in `option_cache`, keyed by the
+    choices. Subsequent renders then only mark the selected options
+    rather than passing every choice through the govuk macro again.
+    Choices from a :class:`~govuk_frontend_wtf.choices.ChoiceProvider`
+    are keyed by the load they came from.
     """
 
     template = "govuk_frontend_wtf/select.html"
+    option_cache = LRUCache(maxsize=32)
+    option_cache_min_choices = 50
 
     def __call__(self, field, **kwargs):
         if self.multiple:
@@ -308,13 +287,21 @@ class GovSelect(GovFormBase, Select):
         if "required" not in kwargs and "required" in getattr(field, "flags", []):
             kwargs["required"] = True
 
-        kwargs["items"] = []
+        choices = [(val, label, selected) for val, label, selected, render_kw in field.iter_choices()]
 
-        # Construct select box choices
-        for val, label, selected, render_kw in field.iter_choices():
-            item = {"text": label, "value": val, "selected": selected}
+        key = None
+        if not kwargs.get("_gov_map_only"):
+            key = self.get_option_cache_key(choices, getattr(field, "choices", None))
+        if key is not None:
+            app = get_app()
+            if app.jinja_env.is_async:
+                return self.render_cached_options_async(get_settings(app), field, choices, key, **kwargs)
+            return self.render_cached_options(get_settings(app), field, choices, key, **kwargs)
 
-            kwargs["items"].append(item)
+        # Construct select box choices
+        kwargs["items"] = [
+            {"text": escape_choice(label), "value": val, "selected": selected} for val, label, selected in choices
+        ]
 
         return super().__call__(field, **kwargs)
 
@@ -324,3 +311,244 @@ class GovSelect(GovFormBase, Select):
         params["items"] = kwargs["items"]
 
         return params
+
+    def get_option_cache_key(self, choices, source=None):
+        """Return the option cache key for these choices, or None if they shouldn't be cached
+
+        Choices loaded by a ChoiceProvider are keyed by their token, rather
+        than by every value and label.
+        """
+        if len(choices) < self.option_cache_min_choices:
+            return None
+
+        if isinstance(source, Choices):
+            return (self.get_template(), source.token)
+
+        key = (self.get_template(), tuple((val, label) for val, label, selected in choices))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+
+        return key
+
+    def render_cached_options(self, settings, field, choices, key, **kwargs):
+        """Render the select around cached option markup, marking the selected options
+
+        Instrumentation records the whole render, including rendering every
+        option on a cache miss, and the size of the spliced output.
+        """
+        start = perf_counter()
+        map_time = 0.0
+
+        cached = self.option_cache.get(key)
+        if cached is None:
+            kwargs["items"] = self.get_unselected_items(choices)
+            mapping = perf_counter()
+            params = self.map_gov_params(field, **kwargs)
+            map_time += perf_counter() - mapping
+            cached = self.index_options(str(self.render(params)), choices)
+            self.option_cache.set(key, cached)
+
+        # Render the rest of the select around a single placeholder option
+        kwargs["items"] = [{"text": "", "value": ""}]
+        mapping = perf_counter()
+        params = self.map_gov_params(field, **kwargs)
+        map_time += perf_counter() - mapping
+        html = self.splice_options(str(self.render_field(settings, field, params)), cached, choices)
+
+        self.record_cached_options(settings, start, map_time, html)
+        return html
+
+    async def render_cached_options_async(self, settings, field, choices, key, **kwargs):
+        """As render_cached_options, in an async Jinja environment"""
+        start = perf_counter()
+        map_time = 0.0
+
+        cached = self.option_cache.get(key)
+        if cached is None:
+            kwargs["items"] = self.get_unselected_items(choices)
+            mapping = perf_counter()
+            params = self.map_gov_params(field, **kwargs)
+            map_time += perf_counter() - mapping
+            cached = self.index_options(str(await self.render_async(params)), choices)
+            self.option_cache.set(key, cached)
+
+        kwargs["items"] = [{"text": "", "value": ""}]
+        mapping = perf_counter()
+        params = self.map_gov_params(field, **kwargs)
+        map_time += perf_counter() - mapping
+        html = self.splice_options(str(await self.render_field_async(settings, field, params)), cached, choices)
+
+        self.record_cached_options(settings, start, map_time, html)
+        return html
+
+    def record_cached_options(self, settings, start, map_time, html):
+        instrumentation = settings.get("instrumentation")
+        if instrumentation is not None:
+            render_time = perf_counter() - start - map_time
+            instrumentation.record(self, map_time, render_time, len(html.encode("utf-8")))
+
+    def get_unselected_items(self, choices):
+        return [{"text": escape_choice(label), "value": val, "selected": False} for val, label, selected in choices]
+
+    def index_options(self, html, choices):
+        """Slice the options out of a rendered select, recording where " selected" would be inserted in each"""
+        start, end = self.find_options(html)
+        options = html[start:end]
+
+        offsets = []
+        position = 0
+        for _ in choices:
+            position = options.index('value="', options.index("<option", position)) + len('value="')
+            position = options.index('"', position) + 1
+            offsets.append(position)
+
+        return options, offsets
+
+    def splice_options(self, html, cached, choices):
+        """Replace the placeholder option in a rendered select with the cached options"""
+        options, offsets = cached
+        start, end = self.find_options(html)
+
+        parts = [html[:start]]
+        position = 0
+        for offset, (val, label, selected) in zip(offsets, choices):
+            if selected:
+                parts.append(options[position:offset])
+                parts.append(" selected")
+                position = offset
+        parts.append(options[position:])
+        parts.append(html[end:])
+
+        return Markup("".join(parts))
+
+    def find_options(self, html):
+        """Return the start and end of the option tags in a rendered select"""
+        start = html.index("<option", html.index("<select"))
+        end = html.rindex("</option>", start, html.index("</select>", start)) + len("</option>")
+        return start, end
+
+
+class GovTypeahead(GovSelect):
+    """Renders a TypeaheadField as a select to enhance with accessible-autocomplete.
+
+    Only the selected option is rendered. The URL of the typeahead
+    endpoint searching the field's index, and the shortest query it will
+    search for, are set as the select's ``data-source`` and
+    ``data-min-length`` attributes for the enhancing script to use.
+    """
+
+    def __call__(self, field, **kwargs):
+        kwargs.setdefault("data-module", "govuk-frontend-wtf-typeahead")
+        kwargs.setdefault("data-source", url_for("govuk_frontend_wtf_typeahead", name=field.index.name))
+        kwargs.setdefault("data-min-length", field.index.min_length)
+        return super().__call__(field, **kwargs)
+
+
+class GovFieldList(GovFormBase):
+    """Renders a FieldList of FormFields as a repeating group of fieldsets.
+
+    A FieldList of single fields is rendered the same way, with each field
+    in a fieldset of its own.
+
+    Each row is rendered as a fieldset, with a legend made from the
+    FieldList's label and the row number, holding each of the row's
+    fields rendered by its own widget. Ids, names, values and errors are
+    those of each row's fields, so they match the links in the error
+    summary.
+
+    The static label, hint and legend params of each child field are built
+    from the first row and shared with the rest, so every row must use the
+    same labels and descriptions.
+
+    :param row_legend: format string for each row's legend, given the
+        FieldList's ``label`` and the 1-based row ``number``.
+    """
+
+    template = "govuk_frontend_wtf/fieldlist.html"
+    legend_classes = "govuk-fieldset__legend--m"
+
+    def __init__(self, row_legend="{label} {number}"):
+        self.row_legend = row_legend
+
+    def __call__(self, field, **kwargs):
+        kwargs.setdefault("id", field.id)
+
+        if get_app().jinja_env.is_async:
+            return self.call_rows_async(field, **kwargs)
+
+        kwargs["items"] = [
+            self.map_row(field, number, entry, [subfield() for subfield in subfields])
+            for number, entry, subfields in self.iter_rows(field)
+        ]
+
+        return super().__call__(field, **kwargs)
+
+    async def call_rows_async(self, field, **kwargs):
+        kwargs["items"] = [
+            self.map_row(field, number, entry, [await self.await_html(subfield()) for subfield in subfields])
+            for number, entry, subfields in self.iter_rows(field)
+        ]
+
+        result = super().__call__(field, **kwargs)
+        return await result if isawaitable(result) else result
+
+    async def await_html(self, html):
+        # Fields without a GOV.UK widget, such as a hidden row id, render synchronously
+        return (await html) if isawaitable(html) else html
+
+    def iter_rows(self, field):
+        """Yield the number, entry and fields of each row, sharing static params between rows
+
+        The entries of a FieldList of single fields are each a row of one field.
+        """
+        shared = {}
+
+        for number, entry in enumerate(field, 1):
+            subfields = list(iter_fields(entry)) if isinstance(entry, FormField) else [entry]
+
+            for subfield in subfields:
+                if not isinstance(subfield.widget, GovFormBase):
+                    continue
+
+                # Key children by their name within the row, e.g. address-postcode
+                name = subfield.name[len(entry.name) + 1 :]
+                static_params = shared.get(name)
+                if static_params is not None and static_params[0] is type(subfield.widget):
+                    if getattr(subfield, "_gov_static_params", None) is None:
+                        subfield._gov_static_params = static_params
+                else:
+                    subfield.widget.get_static_params(subfield)
+                    shared[name] = subfield._gov_static_params
+
+            yield number, entry, subfields
+
+    def map_row(self, field, number, entry, html):
+        return {
+            "legend": {
+                "text": self.row_legend.format(label=field.label.text, number=number),
+                "classes": self.legend_classes,
+            },
+            "html": Markup("".join(str(part) for part in html)),
+            # A single field row's id is the field's own
+            "attributes": {"id": entry.id} if isinstance(entry, FormField) else {},
+        }
+
+    def map_gov_params(self, field, **kwargs):
+        """Map the rendered rows and any remaining attributes
+
+        Errors are shown against each row's fields, so the FieldList's own
+        errors, a list of each row's errors, aren't mapped.
+        """
+        params = {
+            "id": kwargs.pop("id"),
+            "items": kwargs.pop("items"),
+        }
+
+        if "params" in kwargs:
+            params = self.merge_params(params, kwargs.pop("params"))
+
+        params["attributes"] = self.merge_params(dict(params.get("attributes", {})), kwargs)
+
+        return params
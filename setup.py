@@ -39,11 +39,16 @@ setuptools.setup(
     ],
     python_requires=">=3.9",
     install_requires=[
-        "deepmerge",
         "flask",
         "flask-wtf",
         "govuk-frontend-jinja>=3.0.0",
         "jinja2",
         "wtforms>=3.1.0",
     ],
+    entry_points={
+        "console_scripts": [
+            "govuk-frontend-wtf-compile=govuk_frontend_wtf.bundle:main",
+            "govuk-frontend-wtf-prerender=govuk_frontend_wtf.prerender:main",
+        ],
+    },
 )
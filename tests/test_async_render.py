@@ -0,0 +1,143 @@
+import asyncio
+import json
+import unittest
+from importlib.util import find_spec
+
+from flask import render_template_string
+from wtforms import Form
+from wtforms.fields import SelectField, StringField
+
+from govuk_frontend_wtf.cache import FragmentCache
+from govuk_frontend_wtf.main import wtforms_errors, wtforms_errors_async
+from govuk_frontend_wtf.wtforms_widgets import GovSelect, GovTextInput
+from tests.app import create_app
+from tests.fixtures.wtf_widgets_example_form import ExampleForm
+
+FIELDS = ["string_field", "radio_field", "boolean_field", "select_field", "date_field_default", "textarea_field"]
+
+TEMPLATE = "".join(f"{{{{ form.{name}() }}}}" for name in FIELDS) + "{{ govukErrorSummary(wtforms_errors(form)) }}"
+TEMPLATE = '{% from "govuk_frontend_jinja/components/error-summary/macro.html" import govukErrorSummary %}' + TEMPLATE
+
+CHOICES = [(f"option-{index}", f"Option {index}") for index in range(100)]
+
+
+class PlainForm(Form):
+    name = StringField("Name", widget=GovTextInput(), description="Your full name")
+    choice = SelectField("Choice", widget=GovSelect(), choices=CHOICES)
+
+
+def create_async_app(**kwargs):
+    app = create_app(jinja_options={"enable_async": True}, **kwargs)
+    app.config["WTF_CSRF_ENABLED"] = False
+    return app
+
+
+class TestAsyncRender(unittest.TestCase):
+    """Test rendering widgets in an async Jinja environment"""
+
+    def render_sync(self, **request):
+        app = create_app()
+        app.config["WTF_CSRF_ENABLED"] = False
+        with app.test_request_context("/", **request):
+            form = ExampleForm()
+            form.validate_on_submit()
+            return render_template_string(TEMPLATE, form=form)
+
+    async def render_async(self, app, **request):
+        with app.test_request_context("/", **request):
+            form = ExampleForm()
+            form.validate_on_submit()
+            template = app.jinja_env.from_string(TEMPLATE)
+            return await template.render_async(form=form)
+
+    def test_widgets_return_coroutines(self):
+        app = create_async_app()
+
+        with app.test_request_context("/"):
+            result = ExampleForm().string_field()
+            self.assertTrue(asyncio.iscoroutine(result))
+            self.assertIn('name="string_field"', asyncio.run(result))
+
+    def test_output_matches_sync(self):
+        for kwargs in ({}, {"fast_render": True}, {"fragment_cache": FragmentCache()}):
+            with self.subTest(**kwargs):
+                app = create_async_app(**kwargs)
+                self.assertEqual(asyncio.run(self.render_async(app)), self.render_sync())
+
+        data = {"string_field": "John Smith", "date_field": ["1", "2", "2020"], "date_field_default": ["", "", ""]}
+        self.assertEqual(
+            asyncio.run(self.render_async(create_async_app(), method="post", data=data)),
+            self.render_sync(method="post", data=data),
+        )
+
+    def test_concurrent_renders(self):
+        app = create_async_app(fast_render=True)
+        expected = self.render_sync()
+
+        async def render_many():
+            return await asyncio.gather(*(self.render_async(app) for _ in range(20)))
+
+        self.assertEqual(asyncio.run(render_many()), [expected] * 20)
+
+    def test_wtforms_errors_async(self):
+        app = create_async_app()
+        template = app.jinja_env.from_string("{{ wtforms_errors_async(form, {'titleText': 'Check'}) | tojson }}")
+
+        async def render():
+            with app.test_request_context("/", method="post"):
+                form = ExampleForm()
+                form.validate()
+                return form, await wtforms_errors_async(form), await template.render_async(form=form)
+
+        form, errors, output = asyncio.run(render())
+
+        self.assertEqual(errors, wtforms_errors(form))
+        self.assertEqual(json.loads(output), dict(wtforms_errors(form), titleText="Check"))
+        self.assertTrue(errors["errorList"])
+
+    def test_select_option_cache(self):
+        app = create_async_app()
+
+        async def render():
+            with app.test_request_context("/"):
+                form = PlainForm(data={"choice": "option-50"})
+                return [await form.choice() for _ in range(2)]
+
+        with create_app().test_request_context("/"):
+            expected = PlainForm(data={"choice": "option-50"}).choice()
+
+        self.assertEqual(asyncio.run(render()), [expected, expected])
+        self.assertIn('<option value="option-50" selected>Option 50</option>', expected)
+
+
+@unittest.skipUnless(find_spec("quart"), "quart is not installed")
+class TestQuartRender(unittest.TestCase):
+    """Test rendering widgets in a Quart app"""
+
+    def create_app(self, **kwargs):
+        from quart import Quart
+
+        from govuk_frontend_wtf.main import WTFormsHelpers
+
+        app = Quart(__name__)
+        app.jinja_loader = create_app().jinja_loader
+        WTFormsHelpers(app, **kwargs)
+        return app
+
+    def test_output_matches_flask(self):
+        from quart import render_template_string as quart_render_template_string
+
+        template = "{{ form.name() }}{{ form.choice() }}"
+        flask_app = create_app()
+        with flask_app.test_request_context("/"):
+            expected = render_template_string(template, form=PlainForm(data={"choice": "option-1"}))
+
+        for kwargs in ({}, {"fast_render": True}, {"instrumentation": True}):
+            with self.subTest(**kwargs):
+                app = self.create_app(**kwargs)
+
+                async def render():
+                    async with app.app_context():
+                        return await quart_render_template_string(template, form=PlainForm(data={"choice": "option-1"}))
+
+                self.assertEqual(asyncio.run(render()), expected)
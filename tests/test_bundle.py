@@ -0,0 +1,152 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+from flask import Flask, render_template_string
+from jinja2 import ChoiceLoader, DictLoader, PackageLoader, PrefixLoader
+
+from govuk_frontend_wtf.bundle import MANIFEST, BundleLoader, compile_bundle, main, read_manifest
+from govuk_frontend_wtf.main import WTFormsHelpers
+from tests.app import create_app
+from tests.fixtures.wtf_widgets_example_form import ExampleForm
+
+FIELDS = ["string_field", "radio_field", "boolean_field", "select_field", "date_field_default", "charactercount_field"]
+
+TEMPLATE = "".join(f"{{{{ form.{name}() }}}}" for name in FIELDS)
+
+
+class TestBundle(unittest.TestCase):
+    """Test loading widget templates from an ahead of time compiled bundle"""
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+
+    def render(self, app):
+        with app.test_request_context("/"):
+            return render_template_string(TEMPLATE, form=ExampleForm())
+
+    def assertRendersFromBundle(self, app):
+        self.assertIsInstance(app.jinja_env.loader, BundleLoader)
+
+        fallback = app.jinja_env.loader.loaders[1]
+        with mock.patch.object(fallback, "load", wraps=fallback.load) as load:
+            output = self.render(app)
+
+        # None of the widget or macro templates are compiled from source
+        self.assertEqual(load.call_count, 0)
+        self.assertEqual(output, self.render(create_app()))
+
+    def test_directory_bundle(self):
+        path = os.path.join(self.tempdir.name, "bundle")
+        names = compile_bundle(path)
+
+        self.assertIn("govuk_frontend_wtf/input.html", names)
+        self.assertIn("govuk_frontend_jinja/components/label/macro.html", names)
+        self.assertTrue(os.path.isdir(os.path.join(path, "__pycache__")))
+
+        self.assertRendersFromBundle(create_app(compiled_templates=path))
+
+    def test_zip_bundle_from_command(self):
+        path = os.path.join(self.tempdir.name, "bundle.zip")
+        with redirect_stdout(StringIO()) as stdout:
+            main([path, "--zip"])
+
+        self.assertIn(f"to {path}", stdout.getvalue())
+        self.assertRendersFromBundle(create_app(compiled_templates=path))
+
+    def test_async_bundle(self):
+        path = os.path.join(self.tempdir.name, "bundle")
+        compile_bundle(path, enable_async=True)
+        app = create_app(jinja_options={"enable_async": True}, compiled_templates=path)
+
+        async def render():
+            with app.test_request_context("/"):
+                return await app.jinja_env.from_string(TEMPLATE).render_async(form=ExampleForm())
+
+        self.assertEqual(asyncio.run(render()), self.render(create_app()))
+
+    def test_warm_up_with_bundle(self):
+        path = os.path.join(self.tempdir.name, "bundle")
+        compile_bundle(path)
+
+        app = create_app(compiled_templates=path, warm_up=True)
+        self.assertEqual(self.render(app), self.render(create_app()))
+
+    def test_missing_bundle_falls_back_to_source(self):
+        app = create_app(compiled_templates=os.path.join(self.tempdir.name, "missing"))
+
+        self.assertNotIsInstance(app.jinja_env.loader, BundleLoader)
+        self.assertEqual(self.render(app), self.render(create_app()))
+
+    def assertBundleSkipped(self, app_kwargs, reason, **compile_kwargs):
+        path = os.path.join(self.tempdir.name, "bundle")
+        compile_bundle(path, **compile_kwargs)
+
+        with self.assertLogs("tests.app", "WARNING") as logs:
+            app = create_app(compiled_templates=path, **app_kwargs)
+
+        self.assertNotIsInstance(app.jinja_env.loader, BundleLoader)
+        self.assertIn(reason, logs.output[0])
+
+    def test_async_mismatch_skips_bundle(self):
+        self.assertBundleSkipped({"jinja_options": {"enable_async": True}}, "enable_async False")
+
+    def test_minify_mismatch_skips_bundle(self):
+        self.assertBundleSkipped({"minify": True}, "minify False")
+        self.assertBundleSkipped({}, "minify True", minify=True)
+
+    def test_version_mismatch_skips_bundle(self):
+        path = os.path.join(self.tempdir.name, "bundle")
+        compile_bundle(path)
+
+        manifest = read_manifest(path)
+        manifest["govuk-frontend-jinja"] = "0.1.0"
+        with open(os.path.join(path, MANIFEST), "w") as stream:
+            json.dump(manifest, stream)
+
+        with self.assertLogs("tests.app", "WARNING") as logs:
+            app = create_app(compiled_templates=path)
+
+        self.assertNotIsInstance(app.jinja_env.loader, BundleLoader)
+        self.assertIn("govuk-frontend-jinja '0.1.0'", logs.output[0])
+
+    def test_missing_manifest_skips_bundle(self):
+        path = os.path.join(self.tempdir.name, "bundle")
+        compile_bundle(path)
+        os.remove(os.path.join(path, MANIFEST))
+
+        with self.assertLogs("tests.app", "WARNING"):
+            app = create_app(compiled_templates=path)
+
+        self.assertNotIsInstance(app.jinja_env.loader, BundleLoader)
+
+    def test_overridden_template_loaded_from_source(self):
+        path = os.path.join(self.tempdir.name, "bundle.zip")
+        compile_bundle(path, zip="deflated")
+
+        app = Flask(__name__)
+        app.config["WTF_CSRF_ENABLED"] = False
+        app.jinja_loader = ChoiceLoader(
+            [
+                DictLoader({"govuk_frontend_wtf/input.html": "<p>Overridden {{ params.name }}</p>"}),
+                PrefixLoader(
+                    {
+                        "govuk_frontend_jinja": PackageLoader("govuk_frontend_jinja"),
+                        "govuk_frontend_wtf": PackageLoader("govuk_frontend_wtf"),
+                    }
+                ),
+            ]
+        )
+        WTFormsHelpers(app, compiled_templates=path)
+        self.assertIsInstance(app.jinja_env.loader, BundleLoader)
+
+        output = self.render(app)
+
+        self.assertIn("<p>Overridden string_field</p>", output)
+        self.assertIn('class="govuk-radios"', output)
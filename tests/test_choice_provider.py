@@ -0,0 +1,172 @@
+import functools
+import threading
+import time
+import unittest
+from unittest import mock
+
+from werkzeug.datastructures import MultiDict
+from wtforms import Form
+from wtforms.fields import RadioField, SelectField, SelectMultipleField
+
+from govuk_frontend_wtf.cache import LRUCache
+from govuk_frontend_wtf.choices import (
+    ChoiceProvider,
+    Choices,
+    ProvidedRadioField,
+    ProvidedSelectField,
+    ProvidedSelectMultipleField,
+)
+from govuk_frontend_wtf.wtforms_widgets import GovCheckboxesInput, GovRadioInput, GovSelect
+from tests.app import create_app
+
+COUNTRIES = [(str(index), f"Country {index}") for index in range(60)]
+
+
+def load_countries():
+    return COUNTRIES
+
+
+def make_form(choices, select=SelectField, radio=RadioField, multiple=SelectMultipleField):
+    class CountryForm(Form):
+        country = select("Country", choices=choices, widget=GovSelect())
+        region = radio("Region", choices=choices, widget=GovRadioInput())
+        visited = multiple("Visited", choices=choices, widget=GovCheckboxesInput())
+
+    return CountryForm
+
+
+class TestChoiceProvider(unittest.TestCase):
+    """Test loading choices once and sharing them between forms"""
+
+    def setUp(self):
+        self.loader = mock.Mock(return_value=COUNTRIES)
+        self.provider = ChoiceProvider(self.loader, key="countries", cache=LRUCache())
+
+    def test_loaded_once(self):
+        form_class = make_form(self.provider, ProvidedSelectField, ProvidedRadioField, ProvidedSelectMultipleField)
+        self.loader.assert_not_called()
+
+        first = form_class()
+        second = form_class()
+
+        self.loader.assert_called_once_with()
+        self.assertIsInstance(first.country.choices, Choices)
+        self.assertIs(first.country.choices, second.region.choices)
+        self.assertEqual(list(first.visited.choices), COUNTRIES)
+
+    def test_expires(self):
+        provider = ChoiceProvider(self.loader, key="countries", ttl=60, cache=LRUCache())
+
+        with mock.patch("govuk_frontend_wtf.cache.monotonic", return_value=0):
+            first = provider()
+        with mock.patch("govuk_frontend_wtf.cache.monotonic", return_value=30):
+            self.assertIs(provider(), first)
+        with mock.patch("govuk_frontend_wtf.cache.monotonic", return_value=61):
+            self.assertIsNot(provider(), first)
+
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_evicted(self):
+        cache = LRUCache(maxsize=1)
+        countries = ChoiceProvider(self.loader, key="countries", cache=cache)
+        regions = ChoiceProvider(mock.Mock(return_value=[("n", "North")]), key="regions", cache=cache)
+
+        countries()
+        regions()
+        countries()
+
+        self.assertEqual(self.loader.call_count, 2)
+        self.assertEqual(len(cache), 1)
+
+    def test_loaded_once_between_threads(self):
+        def slow_loader():
+            time.sleep(0.05)
+            return COUNTRIES
+
+        loader = mock.Mock(side_effect=slow_loader)
+        provider = ChoiceProvider(loader, key="countries", cache=LRUCache())
+        results = []
+
+        threads = [threading.Thread(target=lambda: results.append(provider())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        loader.assert_called_once_with()
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_default_key(self):
+        self.assertEqual(ChoiceProvider(load_countries).key, f"{__name__}.load_countries")
+        self.assertEqual(ChoiceProvider(load_countries).key, ChoiceProvider(load_countries).key)
+
+    def test_default_key_unique_for_unnamed_loaders(self):
+        cache = LRUCache()
+        providers = [
+            ChoiceProvider(lambda: COUNTRIES, cache=cache),
+            ChoiceProvider(lambda: [("n", "North")], cache=cache),
+            ChoiceProvider(functools.partial(list, COUNTRIES), cache=cache),
+            ChoiceProvider(functools.partial(list, [("s", "South")]), cache=cache),
+        ]
+
+        self.assertEqual(len({provider.key for provider in providers}), 4)
+        self.assertEqual(
+            [provider()[0] for provider in providers], [COUNTRIES[0], ("n", "North"), COUNTRIES[0], ("s", "South")]
+        )
+
+
+class TestProvidedFields(unittest.TestCase):
+    """Test rendering and validating fields with provided choices"""
+
+    def setUp(self):
+        self.app = create_app()
+        provider = ChoiceProvider(lambda: COUNTRIES, key="countries", cache=LRUCache())
+        self.form_class = make_form(provider, ProvidedSelectField, ProvidedRadioField, ProvidedSelectMultipleField)
+        self.plain_form_class = make_form(COUNTRIES)
+
+    def test_renders_as_plain_choices(self):
+        data = MultiDict([("country", "5"), ("region", "7"), ("visited", "1"), ("visited", "2")])
+
+        with self.app.test_request_context("/"):
+            for name in ("country", "region", "visited"):
+                form = self.form_class(data)
+                plain_form = self.plain_form_class(data)
+                self.assertEqual(form[name](), plain_form[name]())
+
+    def test_option_cache_keyed_by_load(self):
+        with self.app.test_request_context("/"):
+            field = self.form_class().country
+            choices = [(val, label, selected) for val, label, selected, render_kw in field.iter_choices()]
+
+            self.assertEqual(
+                field.widget.get_option_cache_key(choices, field.choices),
+                (field.widget.get_template(), field.choices.token),
+            )
+
+    def test_validates_against_set(self):
+        with mock.patch.object(ProvidedSelectField, "iter_choices") as iter_choices:
+            self.assertTrue(self.form_class(MultiDict({"country": "59", "region": "0"})).validate())
+        iter_choices.assert_not_called()
+
+        form = self.form_class(MultiDict([("country", "60"), ("region", "x"), ("visited", "1"), ("visited", "99")]))
+        self.assertFalse(form.validate())
+        self.assertEqual(form.country.errors, ["Not a valid choice."])
+        self.assertEqual(form.region.errors, ["Not a valid choice."])
+        self.assertEqual(form.visited.errors, ["'99' is not a valid choice for this field."])
+
+    def test_coerce(self):
+        class NumberForm(Form):
+            number = ProvidedSelectField(
+                choices=ChoiceProvider(lambda: [(1, "One"), (2, "Two")], key="numbers", cache=LRUCache()), coerce=int
+            )
+
+        self.assertTrue(NumberForm(MultiDict({"number": "2"})).validate())
+        self.assertFalse(NumberForm(MultiDict({"number": "3"})).validate())
+
+    def test_plain_choices(self):
+        class PlainForm(Form):
+            country = ProvidedSelectField(choices=COUNTRIES)
+
+        form = PlainForm(MultiDict({"country": "60"}))
+        self.assertEqual(form.country.choices, COUNTRIES)
+        self.assertFalse(form.validate())
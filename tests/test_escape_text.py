@@ -0,0 +1,66 @@
+import unittest
+
+from markupsafe import Markup
+from wtforms import Form
+from wtforms.fields import RadioField, SelectField, StringField
+
+from govuk_frontend_wtf.gov_form_base import escape_choice, escape_text
+from govuk_frontend_wtf.wtforms_widgets import GovRadioInput, GovSelect, GovTextInput
+from tests.app import create_app
+
+
+class LazyText(object):
+    """Stands in for a lazily translated string"""
+
+    def __str__(self):
+        return "Translated"
+
+
+class EscapedForm(Form):
+    name = StringField("Name & <address>", widget=GovTextInput(), description='Say "hello" & <wave>')
+    colour = RadioField(
+        "Colour", choices=[("r", "Red & <b>bold</b>"), ("g", Markup("<i>Green</i>"))], widget=GovRadioInput()
+    )
+    size = SelectField("Size", choices=[("s", "Small < medium")], widget=GovSelect())
+
+
+class TestEscapeText(unittest.TestCase):
+    """Test static and choice label text is pre-escaped without changing the output"""
+
+    def setUp(self):
+        self.app = create_app()
+
+    def test_escape_text(self):
+        self.assertEqual(escape_text("a & b"), Markup("a &amp; b"))
+        self.assertIsInstance(escape_text("a & b"), Markup)
+        self.assertEqual(escape_text(Markup("<b>a</b>")), Markup("<b>a</b>"))
+
+        lazy = LazyText()
+        self.assertIs(escape_text(lazy), lazy)
+        self.assertIsNone(escape_text(None))
+
+    def test_escape_choice_keeps_markup_apart(self):
+        self.assertEqual(escape_choice("&amp;"), Markup("&amp;amp;"))
+        self.assertEqual(escape_choice(Markup("&amp;")), Markup("&amp;"))
+        self.assertIs(escape_choice("Red"), escape_choice("Red"))
+
+    def test_output_escaped_once(self):
+        with self.app.test_request_context("/"):
+            form = EscapedForm()
+            name = form.name()
+            colour = form.colour()
+            size = form.size()
+
+        self.assertIn("Name &amp; &lt;address&gt;", name)
+        self.assertIn("Say &#34;hello&#34; &amp; &lt;wave&gt;", name)
+        self.assertIn("Red &amp; &lt;b&gt;bold&lt;/b&gt;", colour)
+        self.assertIn("<i>Green</i>", colour)
+        self.assertIn("Small &lt; medium", size)
+
+    def test_params_override_static_text(self):
+        with self.app.test_request_context("/"):
+            output = EscapedForm().name(params={"label": {"text": "Full <name>"}, "hint": {"html": "<b>Bold</b>"}})
+
+        self.assertIn("Full &lt;name&gt;", output)
+        self.assertIn("<b>Bold</b>", output)
+        self.assertNotIn("&lt;address&gt;", output)
@@ -0,0 +1,51 @@
+import unittest
+
+from flask import render_template_string, template_rendered
+
+from tests.app import create_app
+from tests.fixtures.wtf_widgets_example_form import ExampleForm
+
+TEMPLATE = "{{ form.string_field }}{{ form.date_field }}{{ form.select_field }}{{ form.radio_field }}"
+
+
+class TestFastRender(unittest.TestCase):
+    """Test rendering widgets directly against the Jinja environment"""
+
+    def render(self, app):
+        app.config["WTF_CSRF_ENABLED"] = False
+        calls = []
+
+        @app.context_processor
+        def count_calls():
+            calls.append(True)
+            return {}
+
+        rendered = []
+
+        def record(sender, template, context, **extra):
+            rendered.append(template.name)
+
+        with template_rendered.connected_to(record, app), app.test_request_context("/", method="POST"):
+            form = ExampleForm()
+            form.validate_on_submit()
+            output = render_template_string(TEMPLATE, form=form)
+
+        return output, len(calls), rendered
+
+    def test_output_matches_standard_render(self):
+        standard_output, _, _ = self.render(create_app())
+        fast_output, _, _ = self.render(create_app(fast_render=True))
+
+        self.assertEqual(fast_output, standard_output)
+
+    def test_context_processors_run_once_per_request(self):
+        _, standard_calls, standard_rendered = self.render(create_app())
+        _, fast_calls, fast_rendered = self.render(create_app(fast_render=True))
+
+        # One pass for the page plus one per field
+        self.assertEqual(standard_calls, 5)
+        self.assertEqual(len(standard_rendered), 5)
+
+        # One pass for the page plus one shared by all fields
+        self.assertEqual(fast_calls, 2)
+        self.assertEqual(len(fast_rendered), 1)
@@ -0,0 +1,46 @@
+import unittest
+from unittest import mock
+
+from govuk_frontend_wtf.gov_form_base import SingleFieldAdapter
+from govuk_frontend_wtf.wtforms_widgets import GovCheckboxInput
+from tests.app import create_app
+from tests.fixtures.wtf_widgets_example_form import ExampleForm
+
+
+class TestSingleFieldAdapter(unittest.TestCase):
+    """Test presenting a single field as an iterable of subfields"""
+
+    def setUp(self):
+        self.app = create_app()
+
+    def test_iterates_over_field(self):
+        with self.app.test_request_context("/"):
+            field = ExampleForm().boolean_field
+            adapter = SingleFieldAdapter(field)
+
+            self.assertEqual(list(adapter), [field])
+            self.assertEqual(list(adapter), [field])
+
+    def test_attributes(self):
+        with self.app.test_request_context("/"):
+            field = ExampleForm().boolean_field
+            adapter = SingleFieldAdapter(field)
+
+            self.assertEqual((adapter.id, adapter.name, adapter.errors), (field.id, field.name, field.errors))
+            self.assertIs(adapter.label, field.label)
+            self.assertEqual(adapter.type, "BooleanField")
+
+            with self.assertRaises(AttributeError):
+                adapter.extra = True
+
+    def test_static_params_held_on_field(self):
+        with self.app.test_request_context("/"), mock.patch.object(
+            GovCheckboxInput, "build_static_params", autospec=True, side_effect=GovCheckboxInput.build_static_params
+        ) as build_static_params:
+            field = ExampleForm().boolean_field
+            first = field()
+            second = field()
+
+        self.assertEqual(first, second)
+        self.assertEqual(build_static_params.call_count, 1)
+        self.assertIs(field._gov_static_params[0], GovCheckboxInput)
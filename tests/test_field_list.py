@@ -0,0 +1,127 @@
+import asyncio
+import re
+import unittest
+from unittest import mock
+
+from werkzeug.datastructures import MultiDict
+from wtforms import Form
+from wtforms.fields import FieldList, FormField, HiddenField, StringField
+from wtforms.validators import InputRequired
+
+from govuk_frontend_wtf.main import wtforms_errors
+from govuk_frontend_wtf.wtforms_widgets import GovFieldList, GovTextInput
+from tests.app import create_app
+
+
+class AddressForm(Form):
+    postcode = StringField("Postcode", widget=GovTextInput(), validators=[InputRequired(message="Enter a postcode")])
+
+
+class RowForm(Form):
+    row_id = HiddenField()
+    title = StringField(
+        "Title number",
+        widget=GovTextInput(),
+        validators=[InputRequired(message="Enter a title number")],
+        description="For example, AB123456",
+    )
+    address = FormField(AddressForm)
+
+
+class BulkForm(Form):
+    rows = FieldList(FormField(RowForm), label="Property", min_entries=3, widget=GovFieldList())
+
+
+DATA = MultiDict(
+    {"rows-0-title": "AB123456", "rows-0-address-postcode": "PL1 1AA", "rows-1-title": "", "rows-2-title": "CD654321"}
+)
+
+
+class TestGovFieldList(unittest.TestCase):
+    """Test rendering a FieldList as a repeating group"""
+
+    def setUp(self):
+        self.app = create_app()
+
+    def test_rows(self):
+        with self.app.test_request_context("/"):
+            form = BulkForm(DATA)
+            output = form.rows(params={"classes": "app-rows"})
+
+        self.assertIn('<div id="rows" class="app-rows"', output)
+        self.assertEqual(
+            re.findall(r'<fieldset class="govuk-fieldset"\s+id="(rows-\d)"', output), ["rows-0", "rows-1", "rows-2"]
+        )
+        self.assertEqual(re.findall(r"Property \d", output), ["Property 1", "Property 2", "Property 3"])
+        self.assertIn('name="rows-2-title" type="text" value="CD654321"', output)
+        self.assertEqual(output.count("For example, AB123456"), 3)
+
+    def test_errors_line_up_with_error_summary(self):
+        with self.app.test_request_context("/"):
+            form = BulkForm(DATA)
+            form.validate()
+            output = form.rows()
+            error_list = wtforms_errors(form)["errorList"]
+
+        self.assertEqual(len(error_list), 3)
+        for error in error_list:
+            field_id = error["href"][1:]
+            self.assertIn(f'id="{field_id}"', output)
+            self.assertIn(f'<p id="{field_id}-error" class="govuk-error-message">', output)
+
+        self.assertIn("Enter a title number", output)
+        self.assertEqual(output.count("Enter a postcode"), 2)
+
+    def test_static_params_shared_between_rows(self):
+        with self.app.test_request_context("/"), mock.patch.object(
+            GovTextInput, "build_static_params", autospec=True, side_effect=GovTextInput.build_static_params
+        ) as build_static_params:
+            form = BulkForm(DATA)
+            form.rows()
+
+        self.assertEqual(build_static_params.call_count, 2)
+        self.assertIs(form.rows[2].title._gov_static_params, form.rows[0].title._gov_static_params)
+        self.assertIs(
+            form.rows[1].address.postcode._gov_static_params, form.rows[0].address.postcode._gov_static_params
+        )
+
+    def test_row_legend(self):
+        class NamedBulkForm(Form):
+            rows = FieldList(
+                FormField(RowForm),
+                label="Property",
+                min_entries=2,
+                widget=GovFieldList(row_legend="{label} {number} of 2"),
+            )
+
+        with self.app.test_request_context("/"):
+            output = NamedBulkForm().rows()
+
+        self.assertIn("Property 2 of 2", output)
+
+    def test_async(self):
+        app = create_app(jinja_options={"enable_async": True})
+
+        with self.app.test_request_context("/"):
+            expected = BulkForm(DATA).rows()
+
+        async def render():
+            with app.test_request_context("/"):
+                return await BulkForm(DATA).rows()
+
+        self.assertEqual(asyncio.run(render()), expected)
+        self.assertIn('name="rows-2-row_id" type="hidden"', expected)
+
+    def test_single_field_rows(self):
+        class TagsForm(Form):
+            tags = FieldList(
+                StringField("Tag", widget=GovTextInput()), label="Tag", min_entries=2, widget=GovFieldList()
+            )
+
+        with self.app.test_request_context("/"):
+            output = TagsForm(MultiDict({"tags-0": "red", "tags-1": "blue"})).tags()
+
+        self.assertEqual(output.count('<fieldset class="govuk-fieldset"'), 2)
+        self.assertIn("Tag 2", output)
+        self.assertIn('id="tags-1" name="tags-1" type="text" value="blue"', output)
+        self.assertEqual(output.count('id="tags-1"'), 1)
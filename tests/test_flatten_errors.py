@@ -0,0 +1,106 @@
+import types
+import unittest
+from unittest import mock
+
+from govuk_frontend_wtf import main
+from govuk_frontend_wtf.main import flatten_errors, get_id_map, iter_errors, wtforms_errors
+from tests.app import create_app
+from tests.fixtures.wtf_widgets_example_form import ExampleForm
+
+
+class TestFlattenErrors(unittest.TestCase):
+    """Test flattening nested form errors into the error summary list"""
+
+    errors = {
+        "string_field": ["StringField is required", "Second error"],
+        "rows": [
+            {},
+            {"title": ["Enter a title"], "address": {"postcode": ["Enter a postcode"]}},
+            {"title": ["Enter another title"]},
+        ],
+        None: "Form level error",
+    }
+
+    def test_nested_errors_in_document_order(self):
+        self.assertEqual(
+            flatten_errors(self.errors, id_map={"string_field": "custom-id"}),
+            [
+                {"text": "StringField is required", "href": "#custom-id"},
+                {"text": "Enter a title", "href": "#rows-1-title"},
+                {"text": "Enter a postcode", "href": "#rows-1-address-postcode"},
+                {"text": "Enter another title", "href": "#rows-2-title"},
+                {"text": "Form level error", "href": "#None"},
+            ],
+        )
+
+    def test_errors_are_yielded_lazily(self):
+        entries = iter_errors(self.errors)
+
+        self.assertIsInstance(entries, types.GeneratorType)
+        self.assertEqual(next(entries), {"text": "StringField is required", "href": "#string_field"})
+
+    def test_deep_nesting(self):
+        errors = ["Too deep"]
+        for _ in range(5000):
+            errors = {"child": errors}
+
+        self.assertEqual(flatten_errors(errors), [{"text": "Too deep", "href": "#" + "-".join(["child"] * 5000)}])
+
+
+class TestWtformsErrors(unittest.TestCase):
+    """Test the error summary params built from a form"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.app.config["WTF_CSRF_ENABLED"] = False
+
+    def test_id_map_held_per_form(self):
+        with self.app.test_request_context("/", method="post"):
+            form = ExampleForm()
+            form.validate_on_submit()
+
+            self.assertIs(get_id_map(form), get_id_map(form))
+            self.assertEqual(get_id_map(form)["string_field_id"], "custom-id")
+
+            error_list = wtforms_errors(form)["errorList"]
+            self.assertIn({"text": "StringField is required", "href": "#custom-id"}, error_list)
+            self.assertIn({"text": "StringField is required", "href": "#nested_form-0-string_field"}, error_list)
+
+    def test_params_merged(self):
+        with self.app.test_request_context("/", method="post"):
+            form = ExampleForm()
+            form.validate_on_submit()
+
+            params = wtforms_errors(form, params={"titleText": "Problem", "errorList": [{"text": "Extra"}]})
+
+            self.assertEqual(params["titleText"], "Problem")
+            self.assertEqual(params["errorList"][-1], {"text": "Extra"})
+            self.assertEqual(len(params["errorList"]), len(wtforms_errors(form)["errorList"]) + 1)
+
+    def test_error_list_memoized_per_form(self):
+        with self.app.test_request_context("/", method="post"), mock.patch.object(
+            main, "flatten_errors", wraps=flatten_errors
+        ) as flatten:
+            form = ExampleForm()
+            form.validate_on_submit()
+
+            first = wtforms_errors(form)
+            second = wtforms_errors(form, params={"titleText": "Problem"})
+
+            self.assertEqual(flatten.call_count, 1)
+            self.assertEqual(first["errorList"], second["errorList"])
+            self.assertIsNot(first["errorList"], second["errorList"])
+
+    def test_memo_invalidated_when_errors_change(self):
+        with self.app.test_request_context("/", method="post", data={"string_field": "John Smith"}):
+            form = ExampleForm()
+            form.validate_on_submit()
+            count = len(wtforms_errors(form)["errorList"])
+
+            form.string_field.errors.append("Name already registered")
+            self.assertEqual(len(wtforms_errors(form)["errorList"]), count + 1)
+
+            subfield = form.nested_form[0].string_field
+            subfield.data, subfield.raw_data = "Value", ["Value"]
+            form.validate()
+            self.assertEqual(len(wtforms_errors(form)["errorList"]), count - 1)
@@ -0,0 +1,141 @@
+import unittest
+from unittest import mock
+
+from flask import render_template_string
+from jinja2 import DictLoader
+from markupsafe import Markup
+
+from govuk_frontend_wtf.cache import FragmentCache, LRUCache, RedisBackend
+from govuk_frontend_wtf.wtforms_widgets import GovTextInput
+from tests.app import create_app
+from tests.fixtures.wtf_widgets_example_form import ExampleForm
+
+TEMPLATE = "{{ form.string_field }}{{ form.radio_field }}{{ form.date_field }}"
+
+
+class FakeRedis(object):
+    def __init__(self):
+        self.data = {}
+
+    def get(self, name):
+        return self.data.get(name)
+
+    def set(self, name, value, ex=None):
+        self.data[name] = value.encode("utf-8")
+
+
+class TestFragmentCache(unittest.TestCase):
+    """Test caching rendered widget HTML"""
+
+    def render(self, app, **request):
+        app.config["WTF_CSRF_ENABLED"] = False
+        with app.test_request_context("/", **request):
+            form = ExampleForm()
+            form.validate_on_submit()
+            return render_template_string(TEMPLATE, form=form)
+
+    def test_output_matches_uncached(self):
+        fragment_cache = FragmentCache()
+        app = create_app(fragment_cache=fragment_cache)
+        uncached = self.render(create_app())
+
+        self.assertEqual(self.render(app), uncached)
+        self.assertEqual(fragment_cache.stats, {"hits": 0, "misses": 3, "bypasses": 0})
+
+        self.assertEqual(self.render(app), uncached)
+        self.assertEqual(fragment_cache.stats, {"hits": 3, "misses": 3, "bypasses": 0})
+
+    def test_submitted_fields_bypass_cache(self):
+        fragment_cache = FragmentCache()
+        app = create_app(fragment_cache=fragment_cache)
+
+        self.render(app, method="post", data={"string_field": "John Smith", "date_field": ["1", "2", "2020"]})
+
+        self.assertEqual(fragment_cache.stats, {"hits": 0, "misses": 0, "bypasses": 3})
+
+    def test_submitted_fields_cached_when_not_bypassed(self):
+        fragment_cache = FragmentCache(bypass_submitted=False)
+        app = create_app(fragment_cache=fragment_cache)
+        data = {"string_field": "John Smith", "date_field": ["1", "2", "2020"]}
+
+        self.assertEqual(
+            self.render(app, method="post", data=data), self.render(create_app(), method="post", data=data)
+        )
+        self.render(app, method="post", data=data)
+
+        self.assertEqual(fragment_cache.stats, {"hits": 3, "misses": 3, "bypasses": 0})
+
+    def test_prefilled_fields_bypass_cache(self):
+        fragment_cache = FragmentCache()
+        app = create_app(fragment_cache=fragment_cache)
+        app.config["WTF_CSRF_ENABLED"] = False
+
+        with app.test_request_context("/"):
+            form = ExampleForm(data={"string_field": "John Smith", "radio_field": "one"})
+            output = render_template_string(TEMPLATE, form=form)
+
+        self.assertIn('value="John Smith"', output)
+        self.assertEqual(fragment_cache.stats, {"hits": 0, "misses": 1, "bypasses": 2})
+
+    def test_shared_between_environments(self):
+        fragment_cache = FragmentCache()
+        minified = self.render(create_app(fragment_cache=fragment_cache, minify=True))
+
+        override = create_app(fragment_cache=fragment_cache)
+        override.jinja_loader.loaders.insert(
+            0, DictLoader({"govuk_frontend_wtf/input.html": "<p>Overridden {{ params.name }}</p>"})
+        )
+
+        self.assertEqual(self.render(create_app(fragment_cache=fragment_cache)), self.render(create_app()))
+        self.assertEqual(minified, self.render(create_app(minify=True)))
+        self.assertIn("<p>Overridden string_field</p>", self.render(override))
+
+        # Only the overridden app's radios and date input share the plain app's entries
+        self.assertEqual(fragment_cache.stats, {"hits": 2, "misses": 7, "bypasses": 0})
+
+    def test_redis_backend(self):
+        client = FakeRedis()
+        app = create_app(fragment_cache=FragmentCache(backend=RedisBackend(client)))
+
+        self.assertEqual(self.render(app), self.render(create_app()))
+        self.assertEqual(len(client.data), 3)
+        self.assertTrue(all(key.startswith("govuk-frontend-wtf:") for key in client.data))
+        self.assertEqual(self.render(app), self.render(create_app()))
+
+    def test_markup_keyed_separately(self):
+        fragment_cache = FragmentCache()
+        widget = GovTextInput()
+
+        self.assertNotEqual(
+            fragment_cache.make_key(widget, {"label": {"html": Markup("<b>Label</b>")}}),
+            fragment_cache.make_key(widget, {"label": {"html": "<b>Label</b>"}}),
+        )
+        self.assertEqual(
+            fragment_cache.make_key(widget, {"a": 1, "b": [True, None]}),
+            fragment_cache.make_key(widget, {"b": [True, None], "a": 1}),
+        )
+
+
+class TestLRUCache(unittest.TestCase):
+    """Test the in-process cache backend"""
+
+    def test_least_recently_used_evicted(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual((cache.get("a"), cache.get("b"), cache.get("c")), (1, None, 3))
+
+    def test_entries_expire(self):
+        cache = LRUCache(ttl=10)
+
+        with mock.patch("govuk_frontend_wtf.cache.monotonic", return_value=100):
+            cache.set("a", 1)
+            cache.set("b", 2, ttl=20)
+
+        with mock.patch("govuk_frontend_wtf.cache.monotonic", return_value=115):
+            self.assertIsNone(cache.get("a"))
+            self.assertEqual(cache.get("b"), 2)
+            self.assertEqual(len(cache), 1)
@@ -0,0 +1,83 @@
+import unittest
+
+from flask import render_template_string
+from flask_wtf import FlaskForm
+from wtforms.fields import SelectField
+
+from govuk_frontend_wtf.instrumentation import Instrumentation, widgets_rendered
+from govuk_frontend_wtf.wtforms_widgets import GovSelect
+from tests.app import create_app
+from tests.fixtures.wtf_widgets_example_form import ExampleForm
+
+TEMPLATE = "{{ form.string_field }}{{ form.email_field }}{{ form.radio_field }}"
+
+
+class SelectForm(FlaskForm):
+    select_field = SelectField(
+        "Select", widget=GovSelect(), choices=[(f"option-{index}", f"Option {index}") for index in range(500)]
+    )
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Test per widget render timings and counters"""
+
+    def render(self, app):
+        app.config["WTF_CSRF_ENABLED"] = False
+        with app.test_request_context("/"):
+            return render_template_string(TEMPLATE, form=ExampleForm())
+
+    def test_stats_emitted_per_request(self):
+        requests = []
+        instrumentation = Instrumentation(callback=requests.append)
+        app = create_app(instrumentation=instrumentation)
+
+        signalled = []
+
+        def record(sender, stats, **extra):
+            signalled.append((sender, stats))
+
+        with widgets_rendered.connected_to(record, app):
+            output = self.render(app)
+            self.render(app)
+
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(signalled, [(app, requests[0]), (app, requests[1])])
+
+        stats = requests[0]
+        self.assertEqual(set(stats), {"GovTextInput", "GovRadioInput"})
+        self.assertEqual(stats["GovTextInput"]["calls"], 2)
+        self.assertEqual(stats["GovRadioInput"]["calls"], 1)
+        self.assertEqual(
+            sum(widget_stats["bytes"] for widget_stats in stats.values()),
+            len(output.encode("utf-8")),
+        )
+        self.assertGreater(stats["GovTextInput"]["map_time"], 0)
+        self.assertGreater(stats["GovTextInput"]["render_time"], 0)
+
+        self.assertEqual(instrumentation.totals["GovTextInput"]["calls"], 4)
+
+    def test_cached_select_options(self):
+        requests = []
+        app = create_app(instrumentation=Instrumentation(callback=requests.append))
+        app.config["WTF_CSRF_ENABLED"] = False
+
+        outputs = []
+        for _ in range(2):
+            GovSelect.option_cache.clear()
+            with app.test_request_context("/"):
+                outputs.append(render_template_string("{{ form.select_field }}", form=SelectForm()))
+            with app.test_request_context("/"):
+                outputs.append(render_template_string("{{ form.select_field }}", form=SelectForm()))
+
+        # A miss, which renders every option, then a hit, for each request pair
+        self.assertEqual(len(requests), 4)
+        for output, stats in zip(outputs, requests):
+            self.assertEqual(stats["GovSelect"]["calls"], 1)
+            self.assertEqual(stats["GovSelect"]["bytes"], len(output.encode("utf-8")))
+        self.assertGreater(requests[0]["GovSelect"]["render_time"], requests[1]["GovSelect"]["render_time"])
+
+    def test_disabled_by_default(self):
+        app = create_app()
+        self.render(app)
+
+        self.assertIsNone(app.extensions["govuk_frontend_wtf"]["instrumentation"])
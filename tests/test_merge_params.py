@@ -0,0 +1,32 @@
+import unittest
+
+from govuk_frontend_wtf.main import merge_params
+
+
+class TestMergeParams(unittest.TestCase):
+    """Test merging template params into the mapped govuk params"""
+
+    def test_dicts_are_merged_recursively(self):
+        base = {"label": {"text": "Label"}, "attributes": {}}
+        merged = merge_params(base, {"label": {"classes": "govuk-label--l"}, "attributes": {"data-x": "y"}})
+
+        self.assertIs(merged, base)
+        self.assertEqual(
+            merged,
+            {"label": {"text": "Label", "classes": "govuk-label--l"}, "attributes": {"data-x": "y"}},
+        )
+
+    def test_lists_are_appended(self):
+        base = {"errorList": [{"text": "One"}]}
+        merged = merge_params(base, {"errorList": [{"text": "Two"}]})
+
+        self.assertEqual(merged["errorList"], [{"text": "One"}, {"text": "Two"}])
+
+    def test_other_values_override(self):
+        base = {"titleText": "There is a problem", "hint": {"text": "Hint"}, "items": []}
+        merged = merge_params(base, {"titleText": "Problem", "hint": None, "items": "none"})
+
+        self.assertEqual(merged, {"titleText": "Problem", "hint": None, "items": "none"})
+
+    def test_new_keys_are_added(self):
+        self.assertEqual(merge_params({}, {"classes": "a"}), {"classes": "a"})
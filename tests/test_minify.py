@@ -0,0 +1,79 @@
+import os
+import re
+import tempfile
+import unittest
+
+from flask import render_template_string
+
+from govuk_frontend_wtf.bundle import compile_bundle
+from govuk_frontend_wtf.minify import minify
+from tests.app import create_app
+from tests.fixtures.wtf_widgets_example_form import ExampleForm
+
+TEMPLATE = "{% for field in form %}{% if field.widget.template is defined %}{{ field }}{% endif %}{% endfor %}"
+
+POST_DATA = {
+    "string_field": "foo",
+    "textarea_field": "line 1\n\n    line 2  ",
+    "date_field": ["1", "2", "2020"],
+    "date_field_default": ["", "", ""],
+}
+
+
+def normalise(html):
+    return re.sub(r"\s*\n\s*", "\n", html).strip()
+
+
+class TestMinify(unittest.TestCase):
+    """Test collapsing the whitespace in the widget and govuk macro templates"""
+
+    def setUp(self):
+        self.app = create_app(minify=True)
+        self.app.config["WTF_CSRF_ENABLED"] = False
+
+    def render(self, app, data=None, template=TEMPLATE):
+        method = "post" if data else "get"
+        with app.test_request_context("/", method=method, data=data):
+            form = ExampleForm()
+            form.validate_on_submit()
+            return render_template_string(template, form=form)
+
+    def test_output_equivalent(self):
+        # Trimming and stripping around block tags is where the whitespace removed can differ from collapsing it
+        reference = create_app(jinja_options={"trim_blocks": True, "lstrip_blocks": True})
+        reference.config["WTF_CSRF_ENABLED"] = False
+
+        for data in (None, POST_DATA):
+            with self.subTest(data=data):
+                output = self.render(self.app, data)
+                self.assertEqual(normalise(output), normalise(self.render(reference, data)))
+                self.assertLess(len(output), len(self.render(create_app(), data)))
+
+    def test_textarea_preserved(self):
+        output = self.render(self.app, POST_DATA)
+
+        self.assertIn(">line 1\n\n    line 2  </textarea>", output)
+
+    def test_minify(self):
+        html = '<div>\n    <pre class="code">\n  a\n\n  b\n</pre>\n\n  <p>\n    text\n  </p>\n</div>'
+
+        self.assertEqual(minify(html), ('<div>\n<pre class="code">\n  a\n\n  b\n</pre>\n<p>\ntext\n</p>\n</div>', None))
+        self.assertEqual(minify("<TEXTAREA>\n  a\n"), ("<TEXTAREA>\n  a\n", "textarea"))
+        self.assertEqual(minify("  b\n  </textarea>\n  <p>", "textarea"), ("  b\n  </textarea>\n<p>", None))
+
+    def test_other_templates_untouched(self):
+        template = "<div>\n    {{ form.string_field() }}\n\n</div>"
+        output = self.render(self.app, template=template)
+
+        self.assertTrue(output.startswith("<div>\n    <div"))
+        self.assertTrue(output.endswith("\n\n</div>"))
+
+    def test_bundle(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bundle")
+            compile_bundle(path, minify=True)
+
+            app = create_app(minify=True, compiled_templates=path)
+            app.config["WTF_CSRF_ENABLED"] = False
+
+            self.assertEqual(self.render(app, POST_DATA), self.render(self.app, POST_DATA))
@@ -0,0 +1,96 @@
+import tracemalloc
+import unittest
+from unittest import mock
+
+from govuk_frontend_wtf.gov_form_base import GovFormBase
+from govuk_frontend_wtf.wtforms_widgets import GovDateInput
+from tests.app import create_app
+from tests.fixtures.wtf_widgets_example_form import ExampleForm
+
+RENDERS = 200
+
+
+def allocated_blocks(function):
+    """Return the number of memory blocks still held by RENDERS results of function"""
+    function()
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        results = [function() for _ in range(RENDERS)]  # noqa: F841 - held so their blocks are counted
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    return sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+
+
+class TestParamsAllocation(unittest.TestCase):
+    """Test the memory allocated for mapped params on each render"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.app.config["WTF_CSRF_ENABLED"] = False
+
+    def map_params(self, field, **kwargs):
+        return field.widget.map_gov_params(field, id=field.id, **kwargs)
+
+    def test_static_params_shared_between_renders(self):
+        with self.app.test_request_context("/"):
+            form = ExampleForm()
+            fields = [form.string_field, form.textarea_field, form.date_field_default]
+
+            def render_page():
+                return [self.map_params(field, value=field._value()) for field in fields]
+
+            shared = allocated_blocks(render_page)
+            with mock.patch.object(
+                GovFormBase,
+                "get_static_params",
+                autospec=True,
+                side_effect=lambda widget, field: widget.build_static_params(field),
+            ):
+                rebuilt = allocated_blocks(render_page)
+
+            first, second = render_page(), render_page()
+            self.assertIs(first[2]["fieldset"], second[2]["fieldset"])
+            self.assertIs(first[0]["label"], second[0]["label"])
+
+        self.assertLess(shared, rebuilt * 0.7)
+
+    def test_label_and_description_changes_picked_up(self):
+        with self.app.test_request_context("/"):
+            form = ExampleForm()
+            first = str(form.string_field()) + str(form.radio_field())
+
+            form.string_field.label.text = "Full name"
+            form.string_field.description = "As shown on your passport"
+            form.radio_field.label.text = "Pick one"
+            second = str(form.string_field()) + str(form.radio_field())
+
+        self.assertIn("StringFieldHint", first)
+        self.assertNotIn("Full name", first)
+        self.assertIn("Full name", second)
+        self.assertIn("As shown on your passport", second)
+        self.assertNotIn("StringFieldHint", second)
+        self.assertIn("Pick one", second)
+
+    def test_date_items_use_constant_classes(self):
+        with self.app.test_request_context(
+            "/", method="post", data={"date_field": ["1", "2", "2020"], "date_field_default": ["", "", ""]}
+        ):
+            form = ExampleForm()
+            form.validate_on_submit()
+
+            valid = self.map_params(form.date_field, value=form.date_field._value())["items"]
+            invalid = self.map_params(form.date_field_default, value=form.date_field_default._value())["items"]
+
+            again = self.map_params(form.date_field, value=form.date_field._value())["items"]
+
+            # The class strings are the widget's constants, not built again on each render
+            for items, index in ((valid, 2), (invalid, 3), (again, 2)):
+                for item, date_item in zip(items, GovDateInput.date_items):
+                    self.assertIs(item["classes"], date_item[index])
+
+            self.assertEqual([item["value"] for item in valid], ["1", "2", "2020"])
+            self.assertEqual(invalid[2]["classes"], "govuk-input--width-4 govuk-input--error")
@@ -0,0 +1,97 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from govuk_frontend_wtf.prerender import get_filename, get_formdata, iter_records, iter_tasks, main, prerender
+
+FORM = "tests.fixtures.wtf_widgets_example_form:ExampleForm"
+
+RECORDS = [
+    {"id": "case-1", "data": {"string_field": "John Smith", "select_multiple_field": ["one", "three"]}},
+    {"id": "../case-2", "request": {"method": "post", "data": {"string_field": "foo"}}},
+    {"data": {"date_field": ["1", "2", "2020"]}},
+]
+
+
+class TestPrerender(unittest.TestCase):
+    """Test rendering forms in bulk from data records"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.output = os.path.join(self.directory.name, "pages")
+
+    def write_records(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", encoding="utf-8") as stream:
+            stream.write(content)
+        return path
+
+    def read_page(self, name):
+        with open(os.path.join(self.output, name), encoding="utf-8") as stream:
+            return stream.read()
+
+    def test_prerender(self):
+        paths = prerender(FORM, RECORDS, self.output, processes=2, validate=True)
+
+        self.assertEqual(sorted(os.listdir(self.output)), ["000003.html", "case-1.html", "case-2.html"])
+        self.assertEqual(len(paths), 3)
+
+        page = self.read_page("case-1.html")
+        self.assertIn('name="string_field" type="text" value="John Smith"', page)
+        self.assertIn('name="select_multiple_field" type="checkbox" value="three" checked', page)
+        self.assertNotIn("csrf_token", page)
+
+        self.assertIn("Example serverside error", self.read_page("case-2.html"))
+        self.assertIn('name="date_field" type="text" value="2020"', self.read_page("000003.html"))
+
+    def test_record_formats(self):
+        jsonl = self.write_records("records.jsonl", "\n".join(json.dumps(record) for record in RECORDS) + "\n\n")
+        yaml = self.write_records("records.yaml", "- id: a\n  data:\n    string_field: A\n---\nid: b\ndata: {}\n")
+        array = self.write_records("records.json", json.dumps(RECORDS[:2]))
+
+        self.assertEqual(list(iter_records(jsonl)), RECORDS)
+        self.assertEqual(
+            list(iter_records(yaml)), [{"id": "a", "data": {"string_field": "A"}}, {"id": "b", "data": {}}]
+        )
+        self.assertEqual(list(iter_records(array)), RECORDS[:2])
+
+    def test_formdata(self):
+        formdata = get_formdata({"data": {"checkboxes_field": ["one", "two"], "integer_field": 3, "empty": None}})
+
+        self.assertEqual(formdata.getlist("checkboxes_field"), ["one", "two"])
+        self.assertEqual(formdata["integer_field"], "3")
+        self.assertEqual(formdata["empty"], "")
+
+    def test_filename(self):
+        self.assertEqual(get_filename({"id": "../../etc/passwd"}, 1), "etc_passwd.html")
+        self.assertEqual(get_filename({"id": ".."}, 12), "000012.html")
+        self.assertEqual(get_filename({}, 3), "000003.html")
+
+    def test_duplicate_filenames(self):
+        records = [{"id": "a/b"}, {"id": "a_b"}, {"id": "000003"}, {}, {"id": "a_b"}]
+
+        with self.assertWarns(UserWarning):
+            names = [name for name, record in iter_tasks(records)]
+        self.assertEqual(names, ["a_b.html", "a_b-2.html", "000003.html", "000004.html", "a_b-3.html"])
+
+        records = [{"id": "000003", "data": {"string_field": "First"}}, {}, {"data": {"string_field": "Third"}}]
+        with self.assertWarns(UserWarning):
+            prerender(FORM, records, self.output, processes=2, chunksize=1)
+
+        self.assertEqual(sorted(os.listdir(self.output)), ["000002.html", "000003-2.html", "000003.html"])
+        self.assertIn('value="First"', self.read_page("000003.html"))
+        self.assertIn('value="Third"', self.read_page("000003-2.html"))
+
+    def test_main(self):
+        records = self.write_records("records.jsonl", "\n".join(json.dumps(record) for record in RECORDS))
+        stdout = io.StringIO()
+
+        with contextlib.redirect_stdout(stdout):
+            main([FORM, records, "--output", self.output, "--processes", "1"])
+
+        self.assertIn(f"Rendered 3 pages to {self.output}", stdout.getvalue())
+        self.assertEqual(len(os.listdir(self.output)), 3)
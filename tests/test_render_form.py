@@ -0,0 +1,103 @@
+import asyncio
+import re
+import unittest
+from unittest import mock
+
+from flask import render_template_string
+from jinja2 import DictLoader
+from markupsafe import Markup
+from wtforms import Form
+from wtforms.fields import FieldList, FormField, StringField
+
+from govuk_frontend_wtf.batch_render import iter_layout, render_form
+from govuk_frontend_wtf.gov_form_base import GovFormBase
+from govuk_frontend_wtf.wtforms_widgets import GovFieldList, GovTextInput
+from tests.app import create_app
+from tests.fixtures.wtf_widgets_example_form import ExampleForm
+
+DATA = {"date_field": ["1", "2", "2020"], "date_field_default": ["", "", ""], "select_field": "one"}
+
+
+def normalise(html):
+    return re.sub(r"\s+", " ", str(html)).strip()
+
+
+class RowForm(Form):
+    title = StringField("Title number", widget=GovTextInput())
+
+
+class RowsForm(Form):
+    name = StringField("Name", widget=GovTextInput())
+    rows = FieldList(FormField(RowForm), label="Property", min_entries=2, widget=GovFieldList())
+
+
+class TestRenderForm(unittest.TestCase):
+    """Test rendering a whole form in a single template pass"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.app.config["WTF_CSRF_ENABLED"] = False
+
+    def test_matches_rendering_each_field(self):
+        with self.app.test_request_context("/", method="post", data=DATA):
+            form = ExampleForm()
+            form.validate_on_submit()
+
+            expected = "".join(str(field()) for field in iter_layout(form))
+            self.assertEqual(
+                normalise(render_template_string("{{ render_form(form) }}", form=form)), normalise(expected)
+            )
+
+    def test_single_template_render(self):
+        with self.app.test_request_context("/"), mock.patch.object(
+            GovFormBase, "render", autospec=True, side_effect=GovFormBase.render
+        ) as render:
+            output = render_form(ExampleForm())
+
+        self.assertEqual(render.call_count, 1)
+        self.assertIn('name="string_field"', output)
+        self.assertIn('<select class="govuk-select" id="select_field" name="select_field"', output)
+
+    def test_layout(self):
+        with self.app.test_request_context("/"):
+            form = ExampleForm()
+            output = render_form(
+                form, layout=[Markup("<h2>Dates</h2>"), "date_field", "nested_form-0-string_field", "string_field"]
+            )
+
+        self.assertTrue(output.startswith("<h2>Dates</h2>"))
+        self.assertLess(output.index('name="date_field"'), output.index('name="nested_form-0-string_field"'))
+        self.assertLess(output.index('name="nested_form-0-string_field"'), output.index('name="string_field"'))
+        self.assertNotIn('name="email_field"', output)
+
+    def test_widgets_with_other_templates_included(self):
+        with self.app.test_request_context("/"):
+            form = RowsForm()
+            expected = str(form.name()) + str(form.rows())
+
+            self.assertEqual(normalise(render_form(form)), normalise(expected))
+
+    def test_overridden_templates_included(self):
+        override = "<p>Overridden {{ params.name }}</p>"
+        self.app.jinja_loader.loaders.insert(0, DictLoader({"govuk_frontend_wtf/input.html": override}))
+
+        with self.app.test_request_context("/"):
+            form = RowsForm()
+            expected = str(form.name()) + str(form.rows())
+            output = render_form(form)
+
+        self.assertIn("<p>Overridden name</p>", output)
+        self.assertIn("<p>Overridden rows-1-title</p>", output)
+        self.assertEqual(normalise(output), normalise(expected))
+
+    def test_async(self):
+        app = create_app(jinja_options={"enable_async": True})
+
+        with self.app.test_request_context("/"):
+            expected = render_form(RowsForm())
+
+        async def render():
+            with app.test_request_context("/"):
+                return await app.jinja_env.from_string("{{ render_form(form) }}").render_async(form=RowsForm())
+
+        self.assertEqual(normalise(asyncio.run(render())), normalise(expected))
@@ -0,0 +1,61 @@
+import unittest
+
+from flask import render_template_string
+
+from govuk_frontend_wtf.render_plan import RenderPlanMixin
+from tests.app import create_app
+from tests.fixtures.wtf_widgets_example_form import ExampleForm
+
+TEMPLATE = """
+{% for field in form %}{% if field.widget.template is defined %}{{ field }}{% endif %}{% endfor %}
+{{ form.string_field(params={'label': {'classes': 'govuk-label--l'}}) }}
+{{ form.radio_field(params={'fieldset': {'legend': {'classes': 'govuk-fieldset__legend--l'}}}) }}
+"""
+
+
+class PlannedExampleForm(RenderPlanMixin, ExampleForm):
+    pass
+
+
+class TestRenderPlan(unittest.TestCase):
+    """Test sharing static widget params across instances of a form class"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.app.config["WTF_CSRF_ENABLED"] = False
+
+    def render(self, form_class, **request):
+        with self.app.test_request_context("/", **request):
+            form = form_class()
+            form.validate_on_submit()
+            return render_template_string(TEMPLATE, form=form)
+
+    def test_output_matches_unplanned_form(self):
+        data = {
+            "radio_field": "two",
+            "boolean_field": "y",
+            "date_field": ["1", "2", "2020"],
+            "date_field_default": ["", "", ""],
+        }
+
+        for request in ({}, {"method": "post", "data": data}):
+            self.assertEqual(self.render(PlannedExampleForm, **request), self.render(ExampleForm, **request))
+
+    def test_plan_shared_between_instances(self):
+        with self.app.test_request_context("/"):
+            first = PlannedExampleForm()
+            second = PlannedExampleForm()
+
+            self.assertIs(first.get_render_plan(), second.get_render_plan())
+            self.assertIs(
+                first.string_field.widget.get_static_params(first.string_field),
+                second.string_field.widget.get_static_params(second.string_field),
+            )
+            self.assertNotIn("nested_form", first.get_render_plan())
+
+    def test_plan_not_modified_by_template_params(self):
+        self.render(PlannedExampleForm)
+
+        plan = PlannedExampleForm.__dict__["_gov_render_plan"]
+        self.assertEqual(plan["string_field"]["label"], {"text": "StringField"})
+        self.assertEqual(plan["radio_field"]["fieldset"], {"legend": {"text": "RadioField"}})
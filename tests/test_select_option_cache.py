@@ -0,0 +1,69 @@
+import unittest
+
+from flask import render_template_string
+from flask_wtf import FlaskForm
+from wtforms.fields import SelectField
+
+from govuk_frontend_wtf.cache import LRUCache
+from govuk_frontend_wtf.wtforms_widgets import GovSelect
+from tests.app import create_app
+
+CHOICES = [("", "Please select")] + [(f"option-{index}", f"Option <{index}>") for index in range(200)]
+
+
+class UncachedGovSelect(GovSelect):
+    option_cache_min_choices = float("inf")
+
+
+class CachedGovSelect(GovSelect):
+    option_cache = LRUCache(maxsize=2)
+
+
+class SelectForm(FlaskForm):
+    cached = SelectField("Cached", widget=CachedGovSelect(), choices=CHOICES, description="Hint")
+    uncached = SelectField("Uncached", widget=UncachedGovSelect(), choices=CHOICES, description="Hint")
+
+
+class TestSelectOptionCache(unittest.TestCase):
+    """Test caching the option markup of large selects"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.app.config["WTF_CSRF_ENABLED"] = False
+        CachedGovSelect.option_cache.clear()
+
+    def render(self, template, **request):
+        with self.app.test_request_context("/", **request):
+            form = SelectForm()
+            form.validate_on_submit()
+            return render_template_string(template, form=form)
+
+    def assertRendersLikeUncached(self, params="{}", **request):
+        cached = self.render(f"{{{{ form.cached(params={params}) }}}}", **request)
+        uncached = self.render(f"{{{{ form.uncached(params={params}) }}}}", **request)
+
+        self.assertEqual(cached.replace("cached", "uncached"), uncached.replace("Uncached", "Cached"))
+
+    def test_output_matches_uncached(self):
+        self.assertRendersLikeUncached()
+        self.assertRendersLikeUncached()
+        self.assertRendersLikeUncached(method="post", data={"cached": "option-150", "uncached": "option-150"})
+        self.assertRendersLikeUncached(method="post", data={"cached": "option-0", "uncached": "option-0"})
+        self.assertRendersLikeUncached(params="{'classes': 'govuk-!-width-full'}")
+
+        self.assertEqual(len(CachedGovSelect.option_cache), 1)
+
+    def test_selected_option_patched(self):
+        output = self.render("{{ form.cached }}", method="post", data={"cached": "option-150"})
+
+        self.assertRegex(output, '<option value="option-150" selected>Option &lt;150&gt;</option>')
+        self.assertEqual(output.count(" selected"), 1)
+
+    def test_cache_is_bounded(self):
+        with self.app.test_request_context("/"):
+            for count in range(60, 64):
+                form = SelectForm()
+                form.cached.choices = CHOICES[:count]
+                form.cached()
+
+        self.assertEqual(len(CachedGovSelect.option_cache), 2)
@@ -0,0 +1,126 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from flask import render_template_string, stream_template_string
+from flask_wtf import FlaskForm
+from wtforms import Form
+from wtforms.fields import FieldList, FormField, HiddenField, StringField
+
+from govuk_frontend_wtf.main import iter_fields
+from govuk_frontend_wtf.wtforms_widgets import GovFieldList, GovTextInput
+from tests.app import create_app
+
+TEMPLATE = "{% for html in wtforms_stream(form) %}{{ html }}{% endfor %}"
+
+
+class AddressForm(Form):
+    postcode = StringField("Postcode", widget=GovTextInput())
+
+
+class RowForm(Form):
+    title = StringField("Title", widget=GovTextInput())
+    address = FormField(AddressForm)
+
+
+class BulkForm(Form):
+    name = StringField("Name", widget=GovTextInput())
+    rows = FieldList(FormField(RowForm), min_entries=3)
+    notes = StringField("Notes", widget=GovTextInput())
+
+
+class PropertiesForm(Form):
+    name = StringField("Name", widget=GovTextInput())
+    rows = FieldList(FormField(RowForm), label="Property", min_entries=2, widget=GovFieldList())
+
+
+class HiddenForm(FlaskForm):
+    reference = HiddenField(default="AB123")
+    name = StringField("Name", widget=GovTextInput())
+
+
+class TestStream(unittest.TestCase):
+    """Test rendering forms field by field"""
+
+    def setUp(self):
+        self.app = create_app()
+
+    def test_fields_in_document_order(self):
+        self.assertEqual(
+            [field.name for field in iter_fields(BulkForm())],
+            [
+                "name",
+                "rows-0-title",
+                "rows-0-address-postcode",
+                "rows-1-title",
+                "rows-1-address-postcode",
+                "rows-2-title",
+                "rows-2-address-postcode",
+                "notes",
+            ],
+        )
+
+    def test_matches_rendering_each_field(self):
+        with self.app.test_request_context("/"):
+            form = BulkForm()
+            expected = "".join(str(field()) for field in iter_fields(form))
+
+            self.assertEqual(render_template_string(TEMPLATE, form=form), expected)
+            self.assertEqual(
+                render_template_string(TEMPLATE, form=form.rows[1]),
+                str(form.rows[1].title()) + str(form.rows[1].address.postcode()),
+            )
+
+    def test_gov_widgets_not_expanded(self):
+        with self.app.test_request_context("/"):
+            form = PropertiesForm()
+
+            self.assertEqual([field.name for field in iter_fields(form)], ["name", "rows"])
+
+            output = render_template_string(TEMPLATE, form=form)
+            self.assertEqual(output, str(form.name()) + str(form.rows()))
+            self.assertIn("Property 1", output)
+            self.assertIn('<fieldset class="govuk-fieldset"', output)
+
+    def test_streams_before_rendering_every_field(self):
+        @self.app.route("/bulk")
+        def bulk():
+            return stream_template_string(TEMPLATE, form=BulkForm())
+
+        with mock.patch.object(GovTextInput, "__call__", autospec=True, side_effect=GovTextInput.__call__) as render:
+            response = self.app.test_client().get("/bulk", buffered=False)
+            chunks = response.iter_encoded()
+
+            self.assertIn(b'name="name"', next(chunks))
+            self.assertEqual(render.call_count, 1)
+
+            body = b"".join(chunks)
+            response.close()
+
+        self.assertIn(b'name="notes"', body)
+        self.assertEqual(render.call_count, 8)
+
+    def test_async(self):
+        app = create_app(jinja_options={"enable_async": True})
+
+        with self.app.test_request_context("/"):
+            expected = render_template_string(TEMPLATE, form=BulkForm())
+
+        async def render():
+            with app.test_request_context("/"):
+                return await app.jinja_env.from_string(TEMPLATE).render_async(form=BulkForm())
+
+        self.assertEqual(asyncio.run(render()), expected)
+
+    def test_async_hidden_fields(self):
+        app = create_app(jinja_options={"enable_async": True})
+
+        async def render():
+            with app.test_request_context("/"):
+                return await app.jinja_env.from_string(TEMPLATE).render_async(form=HiddenForm())
+
+        output = asyncio.run(render())
+
+        self.assertIn('name="csrf_token" type="hidden"', output)
+        self.assertIn('name="reference" type="hidden" value="AB123"', output)
+        self.assertIn('name="name"', output)
@@ -0,0 +1,41 @@
+import unittest
+
+from flask import Flask
+from jinja2 import DictLoader
+
+from govuk_frontend_wtf.wtforms_widgets import GovTextInput
+from tests.app import create_app
+
+
+class TestTemplateCache(unittest.TestCase):
+    """Test that widget templates are compiled once per Jinja environment"""
+
+    def test_template_is_held_per_environment(self):
+        app = create_app()
+        widget = GovTextInput()
+
+        with app.app_context():
+            template = widget.get_template()
+            self.assertIs(widget.get_template(), template)
+            self.assertIs(GovTextInput().get_template(), template)
+
+        other_app = create_app()
+
+        with other_app.app_context():
+            self.assertIsNot(widget.get_template(), template)
+
+    def test_template_reloaded_only_with_auto_reload(self):
+        loader = DictLoader({"govuk_frontend_wtf/input.html": "first"})
+        reload_app = Flask(__name__)
+        reload_app.jinja_loader = loader
+        widget = GovTextInput()
+
+        with reload_app.app_context():
+            reload_app.jinja_env.auto_reload = False
+            template = widget.get_template()
+
+            loader.mapping["govuk_frontend_wtf/input.html"] = "second"
+            self.assertIs(widget.get_template(), template)
+
+            reload_app.jinja_env.auto_reload = True
+            self.assertEqual(widget.get_template().render(), "second")
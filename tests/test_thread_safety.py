@@ -0,0 +1,60 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import render_template_string
+
+from govuk_frontend_wtf.render_plan import RenderPlanMixin
+from tests.app import create_app
+from tests.fixtures.wtf_widgets_example_form import ExampleForm
+
+TEMPLATE = "{% for field in form %}{% if field.widget.template is defined %}{{ field }}{% endif %}{% endfor %}"
+
+POST_DATA = {"string_field": "foo", "date_field": ["1", "2", "2020"], "date_field_default": ["", "", ""]}
+
+
+class PlannedExampleForm(RenderPlanMixin, ExampleForm):
+    pass
+
+
+class TestThreadSafety(unittest.TestCase):
+    """Test rendering from many threads at once"""
+
+    def setUp(self):
+        self.app = create_app(fast_render=True, fragment_cache=True)
+        self.app.config["WTF_CSRF_ENABLED"] = False
+
+    def render(self, form_class, data):
+        method = "post" if data else "get"
+        with self.app.test_request_context("/", method=method, data=data):
+            form = form_class()
+            form.validate_on_submit()
+            return render_template_string(TEMPLATE, form=form)
+
+    def test_output_identical(self):
+        expected = {data: self.render(ExampleForm, POST_DATA if data else None) for data in (False, True)}
+        barrier = threading.Barrier(8)
+
+        def render(index):
+            if index < 8:
+                barrier.wait()
+            data = bool(index % 2)
+            form_class = PlannedExampleForm if index % 3 else ExampleForm
+            return self.render(form_class, POST_DATA if data else None) == expected[data]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(render, range(48)))
+
+        self.assertTrue(all(results))
+
+    def test_params_reused_between_renders(self):
+        params = {"items": [{"hint": {"text": "The first"}}], "classes": "app-radios"}
+
+        with self.app.test_request_context("/"):
+            form = ExampleForm()
+            first = form.radio_field(params=params)
+            second = form.radio_field(params=params)
+
+        self.assertEqual(first, second)
+        self.assertIn("The first", second)
+        self.assertEqual(params, {"items": [{"hint": {"text": "The first"}}], "classes": "app-radios"})
@@ -0,0 +1,102 @@
+import unittest
+from unittest import mock
+
+from werkzeug.datastructures import MultiDict
+from wtforms import Form
+
+from govuk_frontend_wtf.typeahead import PrefixIndex, TypeaheadField
+from tests.app import create_app
+
+ADDRESSES = [
+    ("1", "1 Plymouth Road, Exeter"),
+    ("2", "2 Plymouth Road, Exeter"),
+    ("3", "Plympton Lodge, Plymouth"),
+    ("4", "10 Exeter Street, Plymouth"),
+    ("5", "The Barbican & <Quay>, Plymouth"),
+]
+
+
+class AddressForm(Form):
+    address = TypeaheadField("Address", index=PrefixIndex("addresses", ADDRESSES, max_results=3))
+
+
+class TestPrefixIndex(unittest.TestCase):
+    """Test searching choices by the start of their words"""
+
+    def setUp(self):
+        self.index = PrefixIndex("addresses", ADDRESSES, max_results=10)
+
+    def test_search(self):
+        self.assertEqual([value for value, label in self.index.search("plympton")], ["3"])
+        self.assertEqual(sorted(value for value, label in self.index.search("PLYM")), ["1", "2", "3", "4", "5"])
+        self.assertEqual(self.index.search("1  plymouth"), [("1", "1 Plymouth Road, Exeter")])
+        self.assertEqual(self.index.search("ymouth"), [])
+
+    def test_limits(self):
+        self.assertEqual(len(self.index.search("plym", limit=2)), 2)
+        self.assertEqual(len(PrefixIndex("addresses", ADDRESSES, max_results=3).search("plym", limit=100)), 3)
+        self.assertEqual(self.index.search("p"), [])
+
+    def test_built_once_from_callable(self):
+        choices = mock.Mock(return_value=ADDRESSES)
+        index = PrefixIndex("addresses", choices)
+
+        choices.assert_not_called()
+        self.assertIn("4", index)
+        self.assertNotIn("6", index)
+        self.assertNotIn(["unhashable"], index)
+        self.assertEqual(index.get_label("5"), "The Barbican & <Quay>, Plymouth")
+        index.search("exeter")
+
+        choices.assert_called_once_with()
+
+
+class TestTypeaheadField(unittest.TestCase):
+    """Test rendering and validating a typeahead field"""
+
+    def setUp(self):
+        self.app = create_app(typeahead=[AddressForm.address.kwargs["index"]])
+
+    def test_renders_selected_option_only(self):
+        with self.app.test_request_context("/"):
+            output = AddressForm(MultiDict({"address": "5"})).address()
+
+        self.assertIn('data-source="/govuk-frontend-wtf/typeahead/addresses"', output)
+        self.assertIn('data-min-length="2"', output)
+        self.assertEqual(output.count("<option"), 2)
+        self.assertIn('<option value="5" selected>The Barbican &amp; &lt;Quay&gt;, Plymouth</option>', output)
+
+    def test_validates_against_index(self):
+        self.assertTrue(AddressForm(MultiDict({"address": "3"})).validate())
+
+        form = AddressForm(MultiDict({"address": "99"}))
+        self.assertFalse(form.validate())
+        self.assertEqual(form.address.errors, ["Not a valid choice."])
+
+
+class TestTypeaheadView(unittest.TestCase):
+    """Test the typeahead endpoint"""
+
+    def setUp(self):
+        self.app = create_app(typeahead=[AddressForm.address.kwargs["index"]])
+        self.client = self.app.test_client()
+
+    def test_search(self):
+        response = self.client.get("/govuk-frontend-wtf/typeahead/addresses?query=exeter")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json,
+            [
+                {"value": "1", "text": "1 Plymouth Road, Exeter"},
+                {"value": "2", "text": "2 Plymouth Road, Exeter"},
+                {"value": "4", "text": "10 Exeter Street, Plymouth"},
+            ],
+        )
+
+    def test_results_bounded(self):
+        self.assertEqual(len(self.client.get("/govuk-frontend-wtf/typeahead/addresses?query=plym").json), 3)
+        self.assertEqual(len(self.client.get("/govuk-frontend-wtf/typeahead/addresses?query=plym&limit=1").json), 1)
+
+    def test_unknown_index(self):
+        self.assertEqual(self.client.get("/govuk-frontend-wtf/typeahead/missing?query=plym").status_code, 404)
@@ -0,0 +1,112 @@
+import unittest
+from unittest import mock
+
+from werkzeug.datastructures import MultiDict
+from wtforms import Form
+from wtforms.fields import FieldList, FormField, StringField
+from wtforms.validators import InputRequired, Length, ValidationError
+
+from govuk_frontend_wtf.main import WTFormsHelpers, find_field, validate_field
+from govuk_frontend_wtf.wtforms_widgets import GovTextInput
+from tests.app import create_app
+
+
+class AddressForm(Form):
+    postcode = StringField(
+        "Postcode", widget=GovTextInput(), validators=[InputRequired(message="Enter a postcode"), Length(max=8)]
+    )
+
+
+class RowForm(Form):
+    title = StringField("Title number", widget=GovTextInput(), validators=[InputRequired(message="Enter a title")])
+    address = FormField(AddressForm)
+
+
+class InlineForm(Form):
+    name = StringField("Name", widget=GovTextInput(), validators=[InputRequired(message="Enter your name")])
+    email = StringField("Email", widget=GovTextInput(), validators=[InputRequired(message="Enter your email")])
+    rows = FieldList(FormField(RowForm), min_entries=2)
+    tags = FieldList(StringField("Tag", widget=GovTextInput(), validators=[InputRequired(message="Enter a tag")]))
+
+    def validate_name(self, field):
+        if field.data == "Admin":
+            raise ValidationError("Name is reserved")
+
+
+class TestValidateField(unittest.TestCase):
+    """Test validating and rendering a single field"""
+
+    def setUp(self):
+        self.app = create_app()
+
+    def test_only_named_field_validated(self):
+        with self.app.test_request_context("/"):
+            form = InlineForm(MultiDict({"name": ""}))
+
+            with mock.patch.object(
+                InputRequired, "__call__", autospec=True, side_effect=InputRequired.__call__
+            ) as call:
+                output = validate_field(form, "name")
+
+        self.assertEqual(call.call_count, 1)
+        self.assertIn("Enter your name", output)
+        self.assertIn('id="name-error"', output)
+        self.assertFalse(form.email.errors)
+
+    def test_inline_validator(self):
+        with self.app.test_request_context("/"):
+            output = validate_field(InlineForm(MultiDict({"name": "Admin"})), "name")
+            valid = validate_field(InlineForm(MultiDict({"name": "Jo"})), "name")
+
+        self.assertIn("Name is reserved", output)
+        self.assertNotIn("govuk-error-message", valid)
+        self.assertIn('value="Jo"', valid)
+
+    def test_nested_fields(self):
+        data = MultiDict({"rows-0-title": "AB1", "rows-1-title": "", "rows-1-address-postcode": "", "tags-0": ""})
+
+        with self.app.test_request_context("/"):
+            postcode = validate_field(InlineForm(data), "rows-1-address-postcode")
+            tag = validate_field(InlineForm(data), "tags-0")
+
+        self.assertIn('<p id="rows-1-address-postcode-error" class="govuk-error-message">', postcode)
+        self.assertIn("Enter a postcode", postcode)
+        self.assertIn("Enter a tag", tag)
+
+    def test_find_field(self):
+        form = InlineForm(MultiDict({"rows-0-title": "AB1", "rows-10-title": "CD2"}))
+
+        owner, field = find_field(form, "rows-10-address-postcode")
+        self.assertIs(field, form.rows[1].address.postcode)
+        self.assertIs(owner, form.rows[1].address.form)
+
+        with self.assertRaises(KeyError):
+            find_field(form, "rows-2-title")
+
+
+class TestInlineValidationView(unittest.TestCase):
+    """Test the view registered for inline validation"""
+
+    def setUp(self):
+        self.app = create_app()
+        WTFormsHelpers().add_inline_validation(self.app, "/validate", InlineForm)
+        self.client = self.app.test_client()
+
+    def test_renders_field(self):
+        response = self.client.post("/validate?field=rows-0-title", data={"rows-0-title": "", "name": ""})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"Enter a title", response.data)
+        self.assertNotIn(b"Enter your name", response.data)
+
+    def test_unknown_field(self):
+        self.assertEqual(self.client.post("/validate?field=missing").status_code, 404)
+        self.assertEqual(self.client.post("/validate").status_code, 404)
+
+    def test_validator_errors_not_hidden(self):
+        self.app.testing = False
+
+        with mock.patch.object(InputRequired, "__call__", side_effect=KeyError("bug")):
+            response = self.client.post("/validate?field=email", data={"email": ""})
+
+        self.assertEqual(response.status_code, 500)
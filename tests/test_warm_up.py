@@ -0,0 +1,43 @@
+import unittest
+from unittest import mock
+
+from flask import render_template_string
+
+from govuk_frontend_wtf.gov_form_base import _template_cache
+from govuk_frontend_wtf.warm_up import iter_widget_templates
+from tests.app import create_app
+from tests.fixtures.wtf_widgets_example_form import ExampleForm
+
+TEMPLATE = "{{ form.string_field }}{{ form.radio_field }}{{ form.select_field }}{{ form.date_field_default }}"
+
+
+class TestWarmUp(unittest.TestCase):
+    """Test compiling widget templates when the app is initialised"""
+
+    def test_widget_and_macro_templates_compiled(self):
+        app = create_app(warm_up=True)
+
+        stats = app.extensions["govuk_frontend_wtf"]["warm_up"]
+        self.assertGreater(stats["time"], 0)
+        self.assertGreater(stats["templates"], len(set(iter_widget_templates())))
+        self.assertIn("govuk_frontend_wtf/select.html", _template_cache[app.jinja_env])
+
+        with app.test_request_context("/"), mock.patch.object(
+            app.jinja_loader, "get_source", wraps=app.jinja_loader.get_source
+        ) as get_source:
+            render_template_string(TEMPLATE, form=ExampleForm())
+
+        self.assertEqual(get_source.call_count, 0)
+
+    def test_output_unchanged(self):
+        with create_app().test_request_context("/"):
+            expected = render_template_string(TEMPLATE, form=ExampleForm())
+
+        with create_app(warm_up=True).test_request_context("/"):
+            self.assertEqual(render_template_string(TEMPLATE, form=ExampleForm()), expected)
+
+    def test_disabled_by_default(self):
+        app = create_app()
+
+        self.assertNotIn("warm_up", app.extensions["govuk_frontend_wtf"])
+        self.assertNotIn(app.jinja_env, _template_cache)